@@ -1,5 +1,17 @@
-from .planner import HealthAgentPlanner
-from .executor import HealthAgentExecutor
-from .memory import HealthMemoryStore
+import importlib
 
-__all__ = ['HealthAgentPlanner', 'HealthAgentExecutor', 'HealthMemoryStore']
\ No newline at end of file
+# Exports resolve on first access so importing one submodule does not pull in
+# the heavier dependencies of the others
+_EXPORTS = {
+    'HealthAgentPlanner': '.planner',
+    'HealthAgentExecutor': '.executor',
+    'HealthMemoryStore': '.memory',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -59,26 +59,25 @@ class HealthTaskExecutor:
         """
         results = []
         
-        # Sort tasks by dependencies
-        sorted_tasks = self._sort_by_dependencies(tasks)
-        
-        for task in sorted_tasks:
-            # Wait for dependencies
-            await self._wait_for_dependencies(task)
-            
-            # Execute task
-            logger.info(f"Executing task {task.id}: {task.description}")
-            result = await self._execute_single_task(task)
-            
-            self.task_results[task.id] = result
-            results.append(result)
-            
-            # Store result in memory if successful
-            if result.success and result.result:
-                await self.memory_store.store_task_result(task, result)
+        # Tasks within a level only depend on earlier levels, so they run concurrently
+        for level in self._group_by_dependency_level(tasks):
+            results.extend(await asyncio.gather(*(self._run_task(task) for task in level)))
                 
         return results
     
+    async def _run_task(self, task: Task) -> TaskResult:
+        """Executes a task, records its result and stores it in memory."""
+        logger.info(f"Executing task {task.id}: {task.description}")
+        result = await self._execute_single_task(task)
+        
+        self.task_results[task.id] = result
+        
+        # Store result in memory if successful
+        if result.success and result.result:
+            await self.memory_store.store_task_result(task, result)
+        
+        return result
+    
     async def _execute_single_task(self, task: Task) -> TaskResult:
         """Executes a single task based on its type."""
         try:
@@ -393,35 +392,27 @@ class HealthTaskExecutor:
             "data": data
         }
     
-    def _sort_by_dependencies(self, tasks: List[Task]) -> List[Task]:
-        """Sorts tasks based on their dependencies."""
-        sorted_tasks = []
+    def _group_by_dependency_level(self, tasks: List[Task]) -> List[List[Task]]:
+        """Groups tasks into levels whose dependencies are all in earlier levels."""
+        levels = []
+        done = set()
         remaining = tasks.copy()
         
         while remaining:
             # Find tasks with no dependencies or dependencies already satisfied
-            ready = [t for t in remaining if all(
-                dep in [st.id for st in sorted_tasks] 
-                for dep in t.dependencies
-            )]
+            ready = [t for t in remaining if all(dep in done for dep in t.dependencies)]
             
             if not ready:
                 # Circular dependency or missing dependency
                 logger.warning("Circular or missing dependencies detected")
-                sorted_tasks.extend(remaining)
+                levels.append(remaining)
                 break
                 
-            sorted_tasks.extend(ready)
-            for t in ready:
-                remaining.remove(t)
+            levels.append(ready)
+            done.update(t.id for t in ready)
+            remaining = [t for t in remaining if t.id not in done]
                 
-        return sorted_tasks
-    
-    async def _wait_for_dependencies(self, task: Task):
-        """Waits for task dependencies to complete."""
-        for dep_id in task.dependencies:
-            while dep_id not in self.task_results:
-                await asyncio.sleep(0.1)
+        return levels
     
     def _extract_health_metrics(self, analysis: str) -> Dict[str, Any]:
         """Extracts structured health metrics from analysis text."""
@@ -111,9 +111,7 @@ class HealthMemoryStore:
     
     async def store_health_metrics(self, metrics: Dict[str, Any], source: str = "manual"):
         """Stores health metrics in the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        rows = []
         for metric_name, value in metrics.items():
             # Handle complex values
             if isinstance(value, dict):
@@ -124,12 +122,14 @@ class HealthMemoryStore:
                 actual_value = str(value)
                 unit = ''
                 metadata = None
-                
-            cursor.execute("""
-                INSERT INTO health_metrics (metric_name, value, unit, source, metadata)
-                VALUES (?, ?, ?, ?, ?)
-            """, (metric_name, actual_value, unit, source, metadata))
-            
+            rows.append((metric_name, actual_value, unit, source, metadata))
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO health_metrics (metric_name, value, unit, source, metadata)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
         conn.commit()
         conn.close()
         
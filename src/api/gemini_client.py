@@ -1,6 +1,6 @@
 import logging
 import os
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, AsyncIterator, List, Optional, Union
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 import asyncio
@@ -372,6 +372,41 @@ class GeminiClient:
             logger.error(f"Error generating text: {str(e)}")
             raise
     
+    async def stream_text(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Streams generated text as Gemini produces it.
+        
+        Args:
+            prompt: The generation prompt
+            
+        Yields:
+            Text deltas in generation order
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.text_model.generate_content,
+                prompt,
+                safety_settings=self.safety_settings,
+                stream=True
+            )
+            
+            # Pull chunks off the blocking iterator without stalling the loop
+            chunks = iter(response)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                if chunk.parts:
+                    yield chunk.text
+            
+            if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
+                if getattr(response.prompt_feedback, 'block_reason', None):
+                    logger.warning(f"Content blocked: {response.prompt_feedback.block_reason}")
+                    yield "I'm unable to process this request due to content safety filters. Please rephrase your question."
+        except Exception as e:
+            logger.error(f"Error streaming text: {str(e)}")
+            raise
+    
     async def analyze_health_document(self, document_text: str, 
                                     document_type: str = "unknown") -> Dict[str, Any]:
         """Analyze health document using Gemini."""
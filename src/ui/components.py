@@ -1,14 +1,340 @@
+import copy
+import hashlib
 import streamlit as st
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+
+# Shared stylesheet for the components below; emitted once per script run by
+# HIAComponents.inject_css so individual cards only carry class names and
+# a couple of CSS custom properties.
+_CSS_BLOB = """
+<style>
+    .hia-score-card {
+        background: linear-gradient(145deg, #ffffff, var(--accent-bg));
+        border: 1px solid color-mix(in srgb, var(--accent) 19%, transparent);
+        border-left: 4px solid var(--accent);
+        border-radius: 16px;
+        padding: 2rem;
+        margin-bottom: 1.5rem;
+        box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12);
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        position: relative;
+        overflow: hidden;
+    }
+    .hia-score-card:hover {
+        transform: translateY(-4px);
+        box-shadow: 0 8px 30px rgba(44, 90, 160, 0.15);
+    }
+    .hia-score-card__header {
+        display: flex;
+        justify-content: space-between;
+        align-items: flex-start;
+        margin-bottom: 1.5rem;
+    }
+    .hia-score-card__header h3 {
+        margin: 0;
+        color: var(--accent);
+        font-family: 'Poppins', sans-serif;
+        font-weight: 600;
+        font-size: 1.2rem;
+    }
+    .hia-score-card__emoji { font-size: 2rem; }
+    .hia-score-card__score { text-align: center; margin-bottom: 1.5rem; }
+    .hia-score-card__value {
+        font-size: 3.5rem;
+        font-weight: 700;
+        color: var(--accent);
+        font-family: 'Poppins', sans-serif;
+        line-height: 1;
+        margin-bottom: 0.5rem;
+    }
+    .hia-score-card__status { text-align: center; }
+    .hia-score-card__pill {
+        display: inline-block;
+        background-color: color-mix(in srgb, var(--accent) 12%, transparent);
+        color: var(--accent);
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        font-size: 0.9rem;
+        font-weight: 500;
+        font-family: 'Inter', sans-serif;
+        margin-bottom: 0.5rem;
+    }
+    .hia-score-card__description {
+        margin-top: 1rem;
+        padding-top: 1rem;
+        border-top: 1px solid color-mix(in srgb, var(--accent) 12%, transparent);
+    }
+    .hia-muted {
+        font-size: 0.9rem;
+        color: #636e72;
+        font-family: 'Inter', sans-serif;
+    }
+    .hia-muted--small { font-size: 0.8rem; }
+    
+    .hia-rec-card {
+        background: linear-gradient(145deg, #ffffff, var(--accent-bg));
+        border: 1px solid color-mix(in srgb, var(--accent) 19%, transparent);
+        border-left: 4px solid var(--accent);
+        border-radius: 16px;
+        padding: 1.5rem;
+        margin-bottom: 1.5rem;
+        box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12);
+        transition: all 0.3s ease;
+        display: grid;
+        grid-template-columns: 1fr 10fr;
+        column-gap: 1rem;
+    }
+    .hia-rec-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 8px 30px rgba(44, 90, 160, 0.15);
+    }
+    .hia-rec-card__icon { font-size: 2rem; }
+    .hia-rec-card__header {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        margin-bottom: 0.5rem;
+    }
+    .hia-rec-card__header h4 {
+        margin: 0;
+        color: var(--accent);
+        font-family: 'Poppins', sans-serif;
+        font-weight: 600;
+        font-size: 1.1rem;
+    }
+    .hia-rec-card__badge {
+        background-color: color-mix(in srgb, var(--accent) 12%, transparent);
+        color: var(--accent);
+        padding: 0.25rem 0.75rem;
+        border-radius: 12px;
+        font-size: 0.75rem;
+        font-weight: 500;
+        font-family: 'Inter', sans-serif;
+    }
+    .hia-rec-card p {
+        margin: 0;
+        line-height: 1.6;
+        color: #2d3436;
+        font-family: 'Inter', sans-serif;
+    }
+    .hia-rec-card__actions {
+        grid-column: 1 / -1;
+        margin-top: 1rem;
+        padding-top: 1rem;
+        border-top: 1px solid rgba(44, 90, 160, 0.1);
+        display: flex;
+        flex-direction: column;
+        gap: 0.5rem;
+    }
+    .hia-rec-card__actions-title {
+        font-weight: 600;
+        margin-bottom: 0.25rem;
+        color: #2d3436;
+        font-family: 'Inter', sans-serif;
+        font-size: 0.9rem;
+    }
+    .hia-rec-card__action {
+        display: flex;
+        align-items: center;
+        padding: 0.5rem;
+        background-color: rgba(44, 90, 160, 0.05);
+        border-radius: 8px;
+        font-family: 'Inter', sans-serif;
+        font-size: 0.9rem;
+        color: #2d3436;
+    }
+    .hia-rec-card__step {
+        width: 20px;
+        height: 20px;
+        background-color: var(--accent);
+        border-radius: 50%;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-right: 0.75rem;
+        font-size: 0.7rem;
+        color: white;
+        font-weight: bold;
+        flex-shrink: 0;
+    }
+    
+    .hia-progress {
+        background: linear-gradient(145deg, #ffffff, #f8fafe);
+        border: 1px solid rgba(44, 90, 160, 0.1);
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin-bottom: 1rem;
+        box-shadow: 0 2px 10px rgba(44, 90, 160, 0.08);
+    }
+    .hia-progress__header {
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        margin-bottom: 1rem;
+    }
+    .hia-progress__label {
+        font-family: 'Inter', sans-serif;
+        font-weight: 500;
+        color: #2d3436;
+        font-size: 1rem;
+    }
+    .hia-progress__stats { display: flex; align-items: center; gap: 0.5rem; }
+    .hia-progress__count {
+        font-family: 'Poppins', sans-serif;
+        font-weight: 600;
+        color: #2c5aa0;
+        font-size: 1.1rem;
+    }
+    .hia-progress__percent {
+        font-size: 0.9rem;
+        color: #636e72;
+        background-color: rgba(44, 90, 160, 0.125);
+        padding: 0.25rem 0.5rem;
+        border-radius: 8px;
+    }
+    .hia-progress-bar {
+        background-color: rgba(44, 90, 160, 0.1);
+        border-radius: 10px;
+        height: 12px;
+        overflow: hidden;
+        position: relative;
+    }
+    .hia-progress-bar__fill {
+        background: linear-gradient(90deg, #2c5aa0, #00b894);
+        height: 100%;
+        width: var(--progress);
+        border-radius: 10px;
+        transition: width 0.6s cubic-bezier(0.4, 0, 0.2, 1);
+        position: relative;
+        overflow: hidden;
+    }
+    .hia-progress-bar__fill::after {
+        content: '';
+        position: absolute;
+        top: 0;
+        left: 0;
+        right: 0;
+        bottom: 0;
+        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
+        animation: shimmer 2s infinite;
+    }
+    @keyframes shimmer {
+        0% { transform: translateX(-100%); }
+        100% { transform: translateX(100%); }
+    }
+    
+    .hia-info-card {
+        background: linear-gradient(145deg, #ffffff, var(--accent-bg));
+        border: 1px solid var(--accent-border);
+        border-left: 4px solid var(--accent);
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin-bottom: 1.5rem;
+        box-shadow: 0 2px 10px rgba(44, 90, 160, 0.08);
+        transition: all 0.3s ease;
+    }
+    .hia-info-card:hover { box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12); }
+    .hia-info-card__layout { display: flex; align-items: flex-start; gap: 1rem; }
+    .hia-info-card__icon { font-size: 1.5rem; flex-shrink: 0; }
+    .hia-info-card__content { flex: 1; }
+    .hia-info-card h4 {
+        margin: 0 0 0.75rem 0;
+        color: var(--accent);
+        font-family: 'Poppins', sans-serif;
+        font-weight: 600;
+        font-size: 1.1rem;
+    }
+    .hia-info-card p {
+        margin: 0;
+        line-height: 1.6;
+        color: #2d3436;
+        font-family: 'Inter', sans-serif;
+        font-size: 0.95rem;
+    }
+</style>
+"""
+
+# Figure layout defaults resolved once at import; naming the template explicitly
+# lets Plotly skip looking up and merging its default template for every figure
+_GAUGE_LAYOUT = dict(template='none', height=280, margin=dict(l=30, r=30, t=50, b=30))
+_TREND_TEMPLATE = 'plotly_white'
+_TIMELINE_LAYOUT = dict(template=_TREND_TEMPLATE, margin=dict(l=20, r=20, t=60, b=20))
+
+# Chat timestamps rendered per minute; bounded by clearing once it grows too large
+_TS_CACHE: Dict[Tuple[int, Optional[timedelta]], str] = {}
+
+
+def _format_time(timestamp: datetime) -> str:
+    """Formats a timestamp as '%I:%M %p', memoized at minute granularity."""
+    # The label is wall-clock time, so the same instant in another zone differs
+    key = (int(timestamp.timestamp() // 60), timestamp.utcoffset())
+    label = _TS_CACHE.get(key)
+    if label is None:
+        if len(_TS_CACHE) > 4096:
+            _TS_CACHE.clear()
+        label = _TS_CACHE[key] = timestamp.strftime('%I:%M %p')
+    return label
+
+
+def lttb_indices(x: Any, y: Any, n_out: int) -> np.ndarray:
+    """
+    Downsamples a series with Largest-Triangle-Three-Buckets.
+    
+    Args:
+        x: X values in plotting order (numeric, datetime, or anything else,
+            which is treated as evenly spaced)
+        y: Numeric y values
+        n_out: Number of points to keep
+        
+    Returns:
+        Sorted positional indices of the points to keep
+    """
+    x = np.asarray(x)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    elif np.issubdtype(x.dtype, np.number):
+        x = x.astype(float)
+    else:
+        x = np.arange(n, dtype=float)
+    y = np.asarray(y, dtype=float)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Pick the point forming the largest triangle with the previous pick and next bucket's mean
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    
+    return indices
 
 
 class HIAComponents:
     """Reusable UI components for HIA application with modern styling."""
     
+    # plotly.express is only needed by trend_line_chart, so it is imported on first use
+    _px = None
+    
     # Define consistent color scheme
     COLORS = {
         'primary': '#2c5aa0',
@@ -23,6 +349,39 @@ class HIAComponents:
         'text_secondary': '#636e72'
     }
     
+    # Structural scaffolding shared by every gauge; metric_gauge copies it and
+    # patches in the range-dependent values
+    _GAUGE_TEMPLATE = {
+        'axis': {
+            'range': [0, 1],
+            'tickfont': {'size': 12, 'family': 'Inter, sans-serif'}
+        },
+        'bar': {'color': COLORS['success'], 'thickness': 0.8},
+        'bgcolor': "rgba(248, 250, 254, 0.5)",
+        'borderwidth': 2,
+        'bordercolor': "rgba(44, 90, 160, 0.1)",
+        'steps': [
+            {'range': [0, 0.3], 'color': "rgba(225, 112, 85, 0.2)"},
+            {'range': [0.3, 0.7], 'color': "rgba(253, 121, 168, 0.2)"},
+            {'range': [0.7, 1.0], 'color': "rgba(0, 184, 148, 0.2)"}
+        ],
+        'threshold': {
+            'line': {'color': COLORS['primary'], 'width': 3},
+            'thickness': 0.75,
+            'value': 0.85
+        }
+    }
+    
+    @staticmethod
+    def inject_css() -> None:
+        """Emits the shared component stylesheet.
+
+        Call once per script run, before rendering any cards; the app does so
+        from its own stylesheet injection. Not gated on session state:
+        Streamlit drops elements a rerun does not produce.
+        """
+        st.markdown(_CSS_BLOB, unsafe_allow_html=True)
+    
     @staticmethod
     def metric_gauge(value: float, min_val: float, max_val: float, 
                     title: str, unit: str = "") -> go.Figure:
@@ -50,47 +409,59 @@ class HIAComponents:
         else:
             color = HIAComponents.COLORS['success']
         
+        lo30 = min_val + range_size * 0.3
+        lo70 = min_val + range_size * 0.7
+        gauge = copy.deepcopy(HIAComponents._GAUGE_TEMPLATE)
+        gauge['axis']['range'] = [min_val, max_val]
+        gauge['bar']['color'] = color
+        steps = gauge['steps']
+        steps[0]['range'] = [min_val, lo30]
+        steps[1]['range'] = [lo30, lo70]
+        steps[2]['range'] = [lo70, max_val]
+        gauge['threshold']['value'] = max_val * 0.85
+        
         fig = go.Figure(go.Indicator(
             mode="gauge+number+delta",
             value=value,
             domain={'x': [0, 1], 'y': [0, 1]},
             title={'text': title, 'font': {'size': 18, 'family': 'Inter, sans-serif', 'color': HIAComponents.COLORS['text_primary']}},
             number={'suffix': f" {unit}", 'font': {'size': 24, 'family': 'Poppins, sans-serif'}},
-            gauge={
-                'axis': {
-                    'range': [min_val, max_val],
-                    'tickfont': {'size': 12, 'family': 'Inter, sans-serif'}
-                },
-                'bar': {'color': color, 'thickness': 0.8},
-                'bgcolor': "rgba(248, 250, 254, 0.5)",
-                'borderwidth': 2,
-                'bordercolor': "rgba(44, 90, 160, 0.1)",
-                'steps': [
-                    {'range': [min_val, min_val + range_size * 0.3], 'color': "rgba(225, 112, 85, 0.2)"},
-                    {'range': [min_val + range_size * 0.3, min_val + range_size * 0.7], 'color': "rgba(253, 121, 168, 0.2)"},
-                    {'range': [min_val + range_size * 0.7, max_val], 'color': "rgba(0, 184, 148, 0.2)"}
-                ],
-                'threshold': {
-                    'line': {'color': HIAComponents.COLORS['primary'], 'width': 3},
-                    'thickness': 0.75,
-                    'value': max_val * 0.85
-                }
-            }
-        ))
+            gauge=gauge
+        ), layout=_GAUGE_LAYOUT)
         
         # Modern layout with improved spacing and fonts
         fig.update_layout(
-            height=280,
-            margin=dict(l=30, r=30, t=50, b=30),
             paper_bgcolor="rgba(255,255,255,0)",
             plot_bgcolor="rgba(255,255,255,0)",
-            font_family="Inter, sans-serif"
+            font_family="Inter, sans-serif",
+            uirevision='static'
         )
         return fig
     
+    @staticmethod
+    def render_gauge(value: float, min_val: float, max_val: float,
+                     title: str, unit: str = "") -> None:
+        """
+        Renders a metric gauge as a static, read-only chart.
+        
+        Gauges are indicators only, so Plotly's interaction layer, mode bar and
+        Streamlit theme are skipped.
+        
+        Args:
+            value: Current value
+            min_val: Minimum value
+            max_val: Maximum value
+            title: Chart title
+            unit: Unit of measurement
+        """
+        fig = HIAComponents.metric_gauge(value, min_val, max_val, title, unit)
+        st.plotly_chart(fig, use_container_width=True, theme=None,
+                        config={'staticPlot': True, 'displayModeBar': False})
+    
     @staticmethod
     def trend_line_chart(data: pd.DataFrame, x_col: str, y_col: str, 
-                        title: str, reference_lines: Optional[Dict[str, float]] = None) -> go.Figure:
+                        title: str, reference_lines: Optional[Dict[str, float]] = None,
+                        max_points: int = 2000) -> go.Figure:
         """
         Creates a modern trend line chart with enhanced styling and optional reference lines.
         
@@ -100,13 +471,22 @@ class HIAComponents:
             y_col: Column name for y-axis
             title: Chart title
             reference_lines: Dict of reference line names and values
+            max_points: Series longer than this are downsampled with LTTB
             
         Returns:
             Plotly figure object with modern styling
         """
+        if len(data) > max_points:
+            idx = lttb_indices(data[x_col].to_numpy(), data[y_col].to_numpy(), max_points)
+            data = data.iloc[idx]
+        
+        if HIAComponents._px is None:
+            import plotly.express as px
+            HIAComponents._px = px
+        
         # Create line chart with modern styling
-        fig = px.line(data, x=x_col, y=y_col, title=title,
-                     markers=True, line_shape='spline')
+        fig = HIAComponents._px.line(data, x=x_col, y=y_col, title=title,
+                     markers=True, line_shape='spline', template=_TREND_TEMPLATE)
         
         # Update line styling
         fig.update_traces(
@@ -116,24 +496,23 @@ class HIAComponents:
             hovertemplate='<b>%{x}</b><br>%{y}<extra></extra>'
         )
         
-        # Add reference lines with modern styling
-        if reference_lines:
-            for name, value in reference_lines.items():
-                color = HIAComponents.COLORS['danger'] if 'high' in name.lower() else HIAComponents.COLORS['success']
-                fig.add_hline(
-                    y=value, 
-                    line_dash="dash", 
-                    line_color=color,
-                    line_width=2,
-                    annotation_text=name,
-                    annotation_position="right",
-                    annotation=dict(
-                        font=dict(size=12, color=color, family='Inter, sans-serif'),
-                        bgcolor="rgba(255,255,255,0.8)",
-                        bordercolor=color,
-                        borderwidth=1
-                    )
-                )
+        # Build reference lines as layout shapes/annotations and apply them in one update
+        shapes = []
+        annotations = []
+        for name, value in (reference_lines or {}).items():
+            color = HIAComponents.COLORS['danger'] if 'high' in name.lower() else HIAComponents.COLORS['success']
+            shapes.append(dict(
+                type='line', xref='paper', yref='y', x0=0, x1=1, y0=value, y1=value,
+                line=dict(color=color, width=2, dash='dash')
+            ))
+            annotations.append(dict(
+                xref='paper', yref='y', x=1, y=value, xanchor='left',
+                text=name, showarrow=False,
+                font=dict(size=12, color=color, family='Inter, sans-serif'),
+                bgcolor="rgba(255,255,255,0.8)",
+                bordercolor=color,
+                borderwidth=1
+            ))
         
         # Modern layout
         fig.update_layout(
@@ -143,6 +522,8 @@ class HIAComponents:
             ),
             xaxis_title=x_col,
             yaxis_title=y_col,
+            shapes=shapes,
+            annotations=annotations,
             hovermode='x unified',
             height=420,
             paper_bgcolor="rgba(255,255,255,0)",
@@ -169,32 +550,46 @@ class HIAComponents:
         """
         Creates a modern timeline visualization for medications.
         
+        Ongoing medications without an ``end_date`` are drawn up to midnight UTC
+        today rather than the current instant, so the figure stays identical
+        across reruns within a day and cached figures keep hitting. Callers
+        that need the true current time should pass an explicit ``end_date``.
+        
         Args:
             medications: List of medication dictionaries
             
         Returns:
             Plotly figure object with modern styling
         """
-        fig = go.Figure()
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0,
+                                                   microsecond=0, tzinfo=None)
+        fig = go.Figure(layout=_TIMELINE_LAYOUT)
         
         colors = [HIAComponents.COLORS['primary'], HIAComponents.COLORS['secondary'], 
                  HIAComponents.COLORS['info'], HIAComponents.COLORS['warning']]
         
-        for i, med in enumerate(medications):
-            start_date = pd.to_datetime(med['start_date'])
-            end_date = pd.to_datetime(med.get('end_date', datetime.now()))
+        soa = HIAComponents._to_soa(medications, today)
+        hover = np.char.add(np.char.add(np.char.add(np.char.add(
+            '<b>', soa['name']), '</b><br>Dosage: '), soa['dose']), '<br>%{x}<extra></extra>')
+        
+        tickvals: List[int] = []
+        names: List[str] = []
+        for i, (name, hovertemplate) in enumerate(zip(soa['name'], hover)):
+            name = str(name)
+            tickvals.append(i)
+            names.append(name)
             color = colors[i % len(colors)]
             
             # Add trace for each medication with modern styling
             fig.add_trace(go.Scatter(
-                x=[start_date, end_date],
+                x=[soa['start'][i], soa['end'][i]],
                 y=[i, i],
                 mode='lines+markers',
-                name=med['name'],
+                name=name,
                 line=dict(width=12, color=color),
                 marker=dict(size=15, color=color, symbol='circle',
                            line=dict(width=3, color='white')),
-                hovertemplate=f"<b>{med['name']}</b><br>Dosage: {med.get('dosage', 'N/A')}<br>%{{x}}<extra></extra>"
+                hovertemplate=str(hovertemplate)
             ))
         
         # Modern layout
@@ -208,8 +603,8 @@ class HIAComponents:
             yaxis_title="Medications",
             yaxis=dict(
                 tickmode='array',
-                tickvals=list(range(len(medications))),
-                ticktext=[med['name'] for med in medications],
+                tickvals=tickvals,
+                ticktext=names,
                 tickfont=dict(size=12, family='Inter, sans-serif')
             ),
             height=max(300, len(medications) * 60),
@@ -220,12 +615,21 @@ class HIAComponents:
             xaxis=dict(
                 gridcolor="rgba(44, 90, 160, 0.1)",
                 showgrid=True
-            ),
-            margin=dict(l=20, r=20, t=60, b=20)
+            )
         )
         
         return fig
     
+    @staticmethod
+    def _to_soa(medications: List[Dict[str, Any]], default_end: datetime) -> Dict[str, Any]:
+        """Converts medication records into parallel per-field arrays."""
+        return {
+            'name': np.array([str(m['name']) for m in medications], dtype=str),
+            'dose': np.array([str(m.get('dosage', 'N/A')) for m in medications], dtype=str),
+            'start': pd.to_datetime([m['start_date'] for m in medications]),
+            'end': pd.to_datetime([m.get('end_date') or default_end for m in medications]),
+        }
+    
     @staticmethod
     def health_score_card(score: int, category: str, 
                          description: str = "") -> None:
@@ -237,6 +641,13 @@ class HIAComponents:
             category: Category name
             description: Optional description
         """
+        st.markdown(HIAComponents._score_card_html(score, category, description),
+                    unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _score_card_html(score: int, category: str, description: str) -> str:
+        """Builds the health score card HTML; memoized on its primitive inputs."""
         # Determine color, emoji, and status based on score
         if score >= 85:
             color = HIAComponents.COLORS['success']
@@ -263,63 +674,42 @@ class HIAComponents:
             status = "Needs Attention"
             status_desc = "Please consult your doctor"
         
+        description_html = (
+            f'<div class="hia-score-card__description hia-muted">{description}</div>'
+            if description else ''
+        )
+        
         # Create modern card HTML
-        card_html = f"""
-        <div style="
-            background: linear-gradient(145deg, #ffffff, {bg_color});
-            border: 1px solid {color}30;
-            border-left: 4px solid {color};
-            border-radius: 16px;
-            padding: 2rem;
-            margin-bottom: 1.5rem;
-            box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12);
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            position: relative;
-            overflow: hidden;
-        " onmouseover="this.style.transform='translateY(-4px)'; this.style.boxShadow='0 8px 30px rgba(44, 90, 160, 0.15)'"
-           onmouseout="this.style.transform='translateY(0)'; this.style.boxShadow='0 4px 20px rgba(44, 90, 160, 0.12)'">
-            
-            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1.5rem;">
-                <h3 style="margin: 0; color: {color}; font-family: 'Poppins', sans-serif; font-weight: 600; font-size: 1.2rem;">
-                    {category}
-                </h3>
-                <span style="font-size: 2rem;">{emoji}</span>
+        return f"""
+        <div class="hia-score-card" style="--accent: {color}; --accent-bg: {bg_color};">
+            <div class="hia-score-card__header">
+                <h3>{category}</h3>
+                <span class="hia-score-card__emoji">{emoji}</span>
             </div>
-            
-            <div style="text-align: center; margin-bottom: 1.5rem;">
-                <div style="font-size: 3.5rem; font-weight: 700; color: {color}; 
-                           font-family: 'Poppins', sans-serif; line-height: 1; margin-bottom: 0.5rem;">
-                    {score}
-                </div>
-                <div style="font-size: 0.9rem; color: #636e72; font-family: 'Inter', sans-serif;">
-                    out of 100
-                </div>
+            <div class="hia-score-card__score">
+                <div class="hia-score-card__value">{score}</div>
+                <div class="hia-muted">out of 100</div>
             </div>
-            
-            <div style="text-align: center;">
-                <div style="display: inline-block; background-color: {color}20; color: {color}; 
-                           padding: 0.5rem 1rem; border-radius: 20px; font-size: 0.9rem; 
-                           font-weight: 500; font-family: 'Inter', sans-serif; margin-bottom: 0.5rem;">
-                    {status}
-                </div>
-                <div style="font-size: 0.8rem; color: #636e72; font-family: 'Inter', sans-serif;">
-                    {status_desc}
-                </div>
+            <div class="hia-score-card__status">
+                <div class="hia-score-card__pill">{status}</div>
+                <div class="hia-muted hia-muted--small">{status_desc}</div>
             </div>
-            
-            {f'<div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid {color}20; font-size: 0.9rem; color: #636e72; font-family: \'Inter\', sans-serif;">{description}</div>' if description else ''}
+            {description_html}
         </div>
         """
-        
-        st.markdown(card_html, unsafe_allow_html=True)
     
     @staticmethod
-    def lab_results_table(results: List[Dict[str, Any]]) -> None:
+    def lab_results_table(results: List[Dict[str, Any]], max_rows: int = 500,
+                          key: Optional[str] = None) -> None:
         """
         Displays lab results in a modern formatted table with enhanced styling.
         
         Args:
             results: List of lab result dictionaries
+            max_rows: Maximum number of rows to render unless the user asks
+                to see everything
+            key: Widget key for this table's "show all" toggle; defaults to a
+                hash of the results so each table keeps its own state
         """
         if not results:
             st.markdown("""
@@ -342,108 +732,54 @@ class HIAComponents:
         # Convert to DataFrame for better display
         df = pd.DataFrame(results)
         
-        # Enhanced table styling function
-        def style_table(styler):
-            return styler.set_table_styles([
-                {'selector': 'thead th', 'props': [
-                    ('background-color', HIAComponents.COLORS['primary']),
-                    ('color', 'white'),
-                    ('font-family', 'Inter, sans-serif'),
-                    ('font-weight', '600'),
-                    ('padding', '12px'),
-                    ('text-align', 'center')
-                ]},
-                {'selector': 'tbody td', 'props': [
-                    ('padding', '12px'),
-                    ('border-bottom', '1px solid #e0e0e0'),
-                    ('font-family', 'Inter, sans-serif')
-                ]},
-                {'selector': 'tbody tr:hover', 'props': [
-                    ('background-color', '#f8fafe')
-                ]}
-            ]).apply(lambda x: [
-                'background-color: rgba(0, 184, 148, 0.1)' if row.get('is_normal', True) 
-                else 'background-color: rgba(225, 112, 85, 0.1)' 
-                for row in results
-            ], axis=0)
-        
-        # Apply styling and display
-        if len(df.columns) > 0:
-            styled_df = df.style.pipe(style_table)
-            st.dataframe(styled_df, use_container_width=True)
+        # Only render the first max_rows rows unless the user asked for all of them
+        total_rows = len(df)
+        if key is None:
+            key = hashlib.blake2b(repr(results).encode(), digest_size=8).hexdigest()
+        show_all_key = f"_hia_lab_show_all_{key}"
+        has_more = total_rows > max_rows
+        truncated = has_more and not st.session_state.get(show_all_key, False)
+        if truncated:
+            df = df.head(max_rows)
+        
+        # Flag abnormal rows with a status column; formatting is left to the frontend grid
+        if 'is_normal' in df.columns:
+            is_normal = df['is_normal'].fillna(True).astype(bool).to_numpy()
+        else:
+            is_normal = np.ones(len(df), dtype=bool)
+        df = df.assign(status=np.where(is_normal, '✅', '❗'))
+        
+        column_config = {
+            'status': st.column_config.TextColumn('Status'),
+        }
+        if 'is_normal' in df.columns:
+            column_config['is_normal'] = st.column_config.CheckboxColumn()
+        if 'value' in df.columns and pd.api.types.is_numeric_dtype(df['value']):
+            column_config['value'] = st.column_config.NumberColumn(format='%.2f')
+        
+        st.dataframe(df, column_config=column_config, hide_index=True,
+                     use_container_width=True)
+        
+        if has_more:
+            if truncated:
+                st.caption(f"Showing first {max_rows} of {total_rows} rows")
+            # Toggling reruns the script, which re-reads the state above
+            with st.expander("Show all"):
+                st.toggle("Render all rows", key=show_all_key)
     
     @staticmethod
     def chat_message(role: str, content: str, timestamp: datetime) -> None:
         """
-        Displays a modern chat message with enhanced styling and animations.
+        Displays a chat message using Streamlit's native chat container.
         
         Args:
             role: 'user' or 'assistant'
             content: Message content
             timestamp: Message timestamp
         """
-        if role == "user":
-            st.markdown(f"""
-            <div class="chat-message chat-user" style="
-                background: linear-gradient(135deg, {HIAComponents.COLORS['primary']}, {HIAComponents.COLORS['primary_light']});
-                color: white;
-                padding: 1.5rem;
-                border-radius: 20px 20px 6px 20px;
-                margin-bottom: 1rem;
-                margin-left: 15%;
-                box-shadow: 0 4px 20px rgba(44, 90, 160, 0.3);
-                animation: slideInRight 0.3s ease-out;
-                position: relative;
-            ">
-                <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
-                    <div style="width: 8px; height: 8px; background-color: rgba(255,255,255,0.8); 
-                               border-radius: 50%; margin-right: 0.5rem;"></div>
-                    <span style="font-weight: 600; font-size: 0.9rem; opacity: 0.9;">You</span>
-                </div>
-                <div style="line-height: 1.6; margin-bottom: 0.5rem;">{content}</div>
-                <div style="font-size: 0.75rem; opacity: 0.8; text-align: right;">
-                    {timestamp.strftime('%I:%M %p')}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown(f"""
-            <div class="chat-message chat-assistant" style="
-                background: linear-gradient(145deg, #ffffff, {HIAComponents.COLORS['light']});
-                color: {HIAComponents.COLORS['text_primary']};
-                padding: 1.5rem;
-                border-radius: 20px 20px 20px 6px;
-                margin-bottom: 1rem;
-                margin-right: 15%;
-                border: 1px solid rgba(44, 90, 160, 0.1);
-                box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12);
-                animation: slideInLeft 0.3s ease-out;
-                position: relative;
-            ">
-                <div style="display: flex; align-items: center; margin-bottom: 0.5rem;">
-                    <div style="width: 24px; height: 24px; background: linear-gradient(135deg, {HIAComponents.COLORS['primary']}, {HIAComponents.COLORS['secondary']}); 
-                               border-radius: 50%; margin-right: 0.75rem; display: flex; align-items: center; justify-content: center;">
-                        <span style="color: white; font-size: 0.7rem;">🏥</span>
-                    </div>
-                    <span style="font-weight: 600; font-size: 0.9rem; color: {HIAComponents.COLORS['primary']};">HIA Assistant</span>
-                </div>
-                <div style="line-height: 1.6; margin-bottom: 0.5rem;">{content}</div>
-                <div style="font-size: 0.75rem; color: {HIAComponents.COLORS['text_secondary']}; text-align: right;">
-                    {timestamp.strftime('%I:%M %p')}
-                </div>
-            </div>
-            
-            <style>
-                @keyframes slideInLeft {{
-                    from {{ opacity: 0; transform: translateX(-20px); }}
-                    to {{ opacity: 1; transform: translateX(0); }}
-                }}
-                @keyframes slideInRight {{
-                    from {{ opacity: 0; transform: translateX(20px); }}
-                    to {{ opacity: 1; transform: translateX(0); }}
-                }}
-            </style>
-            """, unsafe_allow_html=True)
+        with st.chat_message("user" if role == "user" else "assistant"):
+            st.write(content)
+            st.caption(_format_time(timestamp))
     
     @staticmethod
     def recommendation_card(recommendation: Dict[str, Any]) -> None:
@@ -477,65 +813,34 @@ class HIAComponents:
         priority = recommendation.get('priority', 'low')
         config = priority_config.get(priority, priority_config['low'])
         
+        # Build the whole card, including suggested actions, as one HTML block
+        actions = recommendation.get('actions') or []
+        actions_html = ''
+        if actions:
+            steps = '\n'.join(
+                f'<div class="hia-rec-card__action"><div class="hia-rec-card__step">{i}</div>'
+                f'<span>{action}</span></div>'
+                for i, action in enumerate(actions, start=1)
+            )
+            actions_html = (
+                '<div class="hia-rec-card__actions">'
+                '<div class="hia-rec-card__actions-title">Suggested Actions:</div>'
+                f'{steps}</div>'
+            )
+        
         st.markdown(f"""
-        <div style="
-            background: linear-gradient(145deg, #ffffff, {config['bg_color']});
-            border: 1px solid {config['color']}30;
-            border-left: 4px solid {config['color']};
-            border-radius: 16px;
-            padding: 1.5rem;
-            margin-bottom: 1.5rem;
-            box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12);
-            transition: all 0.3s ease;
-        " onmouseover="this.style.transform='translateY(-2px)'; this.style.boxShadow='0 8px 30px rgba(44, 90, 160, 0.15)'"
-           onmouseout="this.style.transform='translateY(0)'; this.style.boxShadow='0 4px 20px rgba(44, 90, 160, 0.12)'">
-            
-            <div style="display: flex; align-items: flex-start; margin-bottom: 1rem;">
-                <div style="font-size: 2rem; margin-right: 1rem;">{config['icon']}</div>
-                <div style="flex: 1;">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                        <h4 style="margin: 0; color: {config['color']}; font-family: 'Poppins', sans-serif; 
-                                  font-weight: 600; font-size: 1.1rem;">
-                            {recommendation.get('type', 'Recommendation')}
-                        </h4>
-                        <span style="background-color: {config['color']}20; color: {config['color']}; 
-                                    padding: 0.25rem 0.75rem; border-radius: 12px; font-size: 0.75rem; 
-                                    font-weight: 500; font-family: 'Inter', sans-serif;">
-                            {config['label']}
-                        </span>
-                    </div>
-                    <p style="margin: 0; line-height: 1.6; color: {HIAComponents.COLORS['text_primary']}; 
-                             font-family: 'Inter', sans-serif;">
-                        {recommendation.get('recommendation', '')}
-                    </p>
+        <div class="hia-rec-card" style="--accent: {config['color']}; --accent-bg: {config['bg_color']};">
+            <div class="hia-rec-card__icon">{config['icon']}</div>
+            <div>
+                <div class="hia-rec-card__header">
+                    <h4>{recommendation.get('type', 'Recommendation')}</h4>
+                    <span class="hia-rec-card__badge">{config['label']}</span>
                 </div>
+                <p>{recommendation.get('recommendation', '')}</p>
             </div>
+            {actions_html}
+        </div>
         """, unsafe_allow_html=True)
-        
-        # Add suggested actions if available
-        if 'actions' in recommendation and recommendation['actions']:
-            actions_html = '<div style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid rgba(44, 90, 160, 0.1);">'
-            actions_html += f'<div style="font-weight: 600; margin-bottom: 0.75rem; color: {HIAComponents.COLORS["text_primary"]}; font-family: \'Inter\', sans-serif; font-size: 0.9rem;">Suggested Actions:</div>'
-            actions_html += '<div style="display: flex; flex-direction: column; gap: 0.5rem;">'
-            
-            for i, action in enumerate(recommendation['actions']):
-                actions_html += f'''
-                <div style="display: flex; align-items: center; padding: 0.5rem; 
-                           background-color: rgba(44, 90, 160, 0.05); border-radius: 8px;">
-                    <div style="width: 20px; height: 20px; background-color: {config['color']}; 
-                               border-radius: 50%; display: flex; align-items: center; justify-content: center; 
-                               margin-right: 0.75rem; font-size: 0.7rem; color: white; font-weight: bold;">
-                        {i + 1}
-                    </div>
-                    <span style="font-family: 'Inter', sans-serif; font-size: 0.9rem; 
-                                color: {HIAComponents.COLORS['text_primary']};">{action}</span>
-                </div>
-                '''
-            
-            actions_html += '</div></div></div>'
-            st.markdown(actions_html, unsafe_allow_html=True)
-        else:
-            st.markdown('</div>', unsafe_allow_html=True)
     
     @staticmethod
     def progress_indicator(current: int, total: int, label: str) -> None:
@@ -547,67 +852,30 @@ class HIAComponents:
             total: Total value
             label: Progress label
         """
+        st.markdown(HIAComponents._progress_html(current, total, label),
+                    unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _progress_html(current: int, total: int, label: str) -> str:
+        """Builds the progress indicator HTML; memoized on its primitive inputs."""
         progress = current / total if total > 0 else 0
         percentage = int(progress * 100)
         
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(145deg, #ffffff, #f8fafe);
-            border: 1px solid rgba(44, 90, 160, 0.1);
-            border-radius: 12px;
-            padding: 1.5rem;
-            margin-bottom: 1rem;
-            box-shadow: 0 2px 10px rgba(44, 90, 160, 0.08);
-        ">
-            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 1rem;">
-                <span style="font-family: 'Inter', sans-serif; font-weight: 500; 
-                           color: {HIAComponents.COLORS['text_primary']}; font-size: 1rem;">{label}</span>
-                <div style="display: flex; align-items: center; gap: 0.5rem;">
-                    <span style="font-family: 'Poppins', sans-serif; font-weight: 600; 
-                               color: {HIAComponents.COLORS['primary']}; font-size: 1.1rem;">{current}/{total}</span>
-                    <span style="font-size: 0.9rem; color: {HIAComponents.COLORS['text_secondary']};
-                               background-color: {HIAComponents.COLORS['primary']}20; 
-                               padding: 0.25rem 0.5rem; border-radius: 8px;">
-                        {percentage}%
-                    </span>
+        return f"""
+        <div class="hia-progress">
+            <div class="hia-progress__header">
+                <span class="hia-progress__label">{label}</span>
+                <div class="hia-progress__stats">
+                    <span class="hia-progress__count">{current}/{total}</span>
+                    <span class="hia-progress__percent">{percentage}%</span>
                 </div>
             </div>
-            <div style="
-                background-color: rgba(44, 90, 160, 0.1);
-                border-radius: 10px;
-                height: 12px;
-                overflow: hidden;
-                position: relative;
-            ">
-                <div style="
-                    background: linear-gradient(90deg, {HIAComponents.COLORS['primary']}, {HIAComponents.COLORS['secondary']});
-                    height: 100%;
-                    width: {progress * 100}%;
-                    border-radius: 10px;
-                    transition: width 0.6s cubic-bezier(0.4, 0, 0.2, 1);
-                    position: relative;
-                    overflow: hidden;
-                ">
-                    <div style="
-                        position: absolute;
-                        top: 0;
-                        left: 0;
-                        right: 0;
-                        bottom: 0;
-                        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
-                        animation: shimmer 2s infinite;
-                    "></div>
-                </div>
+            <div class="hia-progress-bar">
+                <div class="hia-progress-bar__fill" style="--progress: {progress * 100}%;"></div>
             </div>
         </div>
-        
-        <style>
-            @keyframes shimmer {{
-                0% {{ transform: translateX(-100%); }}
-                100% {{ transform: translateX(100%); }}
-            }}
-        </style>
-        """, unsafe_allow_html=True)
+        """
     
     @staticmethod
     def info_card(title: str, content: str, icon: str = "ℹ️", 
@@ -621,6 +889,13 @@ class HIAComponents:
             icon: Icon to display
             card_type: Card type ('info', 'success', 'warning', 'error')
         """
+        st.markdown(HIAComponents._info_card_html(title, content, icon, card_type),
+                    unsafe_allow_html=True)
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _info_card_html(title: str, content: str, icon: str, card_type: str) -> str:
+        """Builds the information card HTML; memoized on its primitive inputs."""
         type_config = {
             'info': {
                 'color': HIAComponents.COLORS['info'],
@@ -646,31 +921,14 @@ class HIAComponents:
         
         config = type_config.get(card_type, type_config['info'])
         
-        st.markdown(f"""
-        <div style="
-            background: linear-gradient(145deg, #ffffff, {config['bg_color']});
-            border: 1px solid {config['border_color']};
-            border-left: 4px solid {config['color']};
-            border-radius: 12px;
-            padding: 1.5rem;
-            margin-bottom: 1.5rem;
-            box-shadow: 0 2px 10px rgba(44, 90, 160, 0.08);
-            transition: all 0.3s ease;
-        " onmouseover="this.style.boxShadow='0 4px 20px rgba(44, 90, 160, 0.12)'"
-           onmouseout="this.style.boxShadow='0 2px 10px rgba(44, 90, 160, 0.08)'">
-            
-            <div style="display: flex; align-items: flex-start; gap: 1rem;">
-                <div style="font-size: 1.5rem; flex-shrink: 0;">{icon}</div>
-                <div style="flex: 1;">
-                    <h4 style="margin: 0 0 0.75rem 0; color: {config['color']}; 
-                              font-family: 'Poppins', sans-serif; font-weight: 600; font-size: 1.1rem;">
-                        {title}
-                    </h4>
-                    <p style="margin: 0; line-height: 1.6; color: {HIAComponents.COLORS['text_primary']}; 
-                             font-family: 'Inter', sans-serif; font-size: 0.95rem;">
-                        {content}
-                    </p>
+        return f"""
+        <div class="hia-info-card" style="--accent: {config['color']}; --accent-bg: {config['bg_color']}; --accent-border: {config['border_color']};">
+            <div class="hia-info-card__layout">
+                <div class="hia-info-card__icon">{icon}</div>
+                <div class="hia-info-card__content">
+                    <h4>{title}</h4>
+                    <p>{content}</p>
                 </div>
             </div>
         </div>
-        """, unsafe_allow_html=True)
\ No newline at end of file
+        """
@@ -1,19 +1,34 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import asyncio
+import functools
+import hashlib
+import importlib
+import threading
+import time
+import uuid
+import weakref
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
 import os
+import shutil
 from pathlib import Path
+from string import Template
 import pandas as pd
-import base64
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple, TYPE_CHECKING
 
-# Import HIA components
+# Import HIA components; the executor and Gemini client chain load on first use
 from src.agent.planner import HealthAgentPlanner
-from src.agent.executor import HealthTaskExecutor
 from src.agent.memory import HealthMemoryStore
-from src.utils import SecurityManager
-from src.api import GeminiClient
+from src.utils.security import SecurityManager
+from src.ui.components import HIAComponents, lttb_indices
+
+if TYPE_CHECKING:
+    from src.agent.executor import HealthTaskExecutor
+    from src.api.gemini_client import GeminiClient
+    from src.utils.document_parser import DocumentParser
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +40,875 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS is now injected via inject_custom_css() method to prevent caching issues
+# Page stylesheet, built once at import. It is re-emitted on every rerun because
+# Streamlit drops elements a run does not produce, but the payload is identical
+# each time so the frontend leaves the existing element in place.
+_HIA_CSS = """
+    <style id="hia-custom-styles">
+        /* Import modern fonts */
+        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Poppins:wght@300;400;500;600;700&display=swap');
+            
+            /* Root variables for consistent theming */
+            :root {
+                --primary-color: #2c5aa0;
+                --primary-light: #4a90e2;
+                --primary-dark: #1e3d73;
+                --secondary-color: #00b894;
+                --secondary-light: #26d0ce;
+                --warning-color: #fd79a8;
+                --danger-color: #e17055;
+                --success-color: #00b894;
+                --info-color: #74b9ff;
+                --light-bg: #f8fafe;
+                --card-bg: #ffffff;
+                --text-primary: #2d3436;
+                --text-secondary: #636e72;
+                --text-light: #b2bec3;
+                --border-color: #ddd;
+                --shadow-light: 0 2px 10px rgba(44, 90, 160, 0.08);
+                --shadow-medium: 0 4px 20px rgba(44, 90, 160, 0.12);
+                --shadow-heavy: 0 8px 30px rgba(44, 90, 160, 0.15);
+                --border-radius: 12px;
+                --border-radius-lg: 16px;
+            }
+            
+            /* Force override Streamlit defaults */
+            .main .block-container {
+                padding-top: 2rem !important;
+                padding-bottom: 2rem !important;
+                max-width: 1400px !important;
+            }
+            
+            /* Hide Streamlit elements */
+            #MainMenu {visibility: hidden !important;}
+            footer {visibility: hidden !important;}
+            header {visibility: hidden !important;}
+            .stDeployButton {display: none !important;}
+            
+            /* Main header styling */
+            .main-header {
+                font-family: 'Poppins', sans-serif !important;
+                font-size: 3.5rem !important;
+                font-weight: 700 !important;
+                background: linear-gradient(135deg, var(--primary-color), var(--primary-light)) !important;
+                -webkit-background-clip: text !important;
+                -webkit-text-fill-color: transparent !important;
+                background-clip: text !important;
+                text-align: center !important;
+                margin-bottom: 3rem !important;
+                letter-spacing: -0.02em !important;
+            }
+            
+            /* Enhanced buttons */
+            .stButton > button {
+                font-family: 'Inter', sans-serif !important;
+                font-weight: 500 !important;
+                border-radius: var(--border-radius) !important;
+                border: none !important;
+                padding: 0.75rem 2rem !important;
+                transition: all 0.3s ease !important;
+                box-shadow: var(--shadow-light) !important;
+            }
+            
+            .stButton > button:hover {
+                transform: translateY(-1px) !important;
+                box-shadow: var(--shadow-medium) !important;
+            }
+            
+            .stButton > button[kind="primary"], .stButton > button[type="primary"] {
+                background: linear-gradient(135deg, var(--primary-color), var(--primary-light)) !important;
+                color: white !important;
+            }
+            
+            /* Form styling */
+            .stTextInput > div > div > input,
+            .stTextArea > div > div > textarea,
+            .stSelectbox > div > div > select {
+                border-radius: var(--border-radius) !important;
+                border: 2px solid var(--border-color) !important;
+                padding: 0.75rem !important;
+                font-family: 'Inter', sans-serif !important;
+                transition: border-color 0.3s ease, box-shadow 0.3s ease !important;
+                background-color: white !important;
+            }
+            
+            .stTextInput > div > div > input:focus,
+            .stTextArea > div > div > textarea:focus,
+            .stSelectbox > div > div > select:focus {
+                border-color: var(--primary-color) !important;
+                box-shadow: 0 0 0 3px rgba(44, 90, 160, 0.1) !important;
+                outline: none !important;
+            }
+            
+            /* Tab styling */
+            .stTabs [data-baseweb="tab-list"] {
+                gap: 1rem !important;
+                background-color: transparent !important;
+                border-bottom: 2px solid var(--border-color) !important;
+            }
+            
+            .stTabs [data-baseweb="tab"] {
+                height: 3rem !important;
+                padding: 0 1.5rem !important;
+                border-radius: var(--border-radius) var(--border-radius) 0 0 !important;
+                font-family: 'Inter', sans-serif !important;
+                font-weight: 500 !important;
+                color: var(--text-secondary) !important;
+                background-color: transparent !important;
+                border: none !important;
+                transition: all 0.3s ease !important;
+            }
+            
+            .stTabs [aria-selected="true"] {
+                background-color: var(--primary-color) !important;
+                color: white !important;
+                box-shadow: var(--shadow-light) !important;
+            }
+            
+            /* Sidebar styling */
+            .css-1d391kg {
+                background: linear-gradient(180deg, var(--light-bg), #ffffff) !important;
+                border-right: 1px solid var(--border-color) !important;
+            }
+            
+            /* Info cards */
+            .info-card {
+                background: linear-gradient(145deg, #ffffff, #f8fafe) !important;
+                border: 1px solid rgba(44, 90, 160, 0.08) !important;
+                border-left: 4px solid var(--info-color) !important;
+                border-radius: var(--border-radius) !important;
+                padding: 1.5rem !important;
+                margin-bottom: 1.5rem !important;
+                box-shadow: var(--shadow-light) !important;
+                transition: all 0.3s ease !important;
+            }
+            
+            .info-card:hover { box-shadow: var(--shadow-medium) !important; }
+            .warning-card { border-left-color: var(--warning-color) !important; background: linear-gradient(145deg, #fff8f0, #ffffff) !important; }
+            .success-card { border-left-color: var(--success-color) !important; background: linear-gradient(145deg, #f0fff8, #ffffff) !important; }
+            .error-card { border-left-color: var(--danger-color) !important; background: linear-gradient(145deg, #fff0f0, #ffffff) !important; }
+            
+            /* Progress bars */
+            .stProgress > div > div > div > div {
+                background: linear-gradient(90deg, var(--primary-color), var(--secondary-color)) !important;
+                border-radius: 10px !important;
+            }
+            
+            /* File uploader styling */
+            .stFileUploader {
+                background-color: var(--light-bg) !important;
+                border: 2px dashed var(--border-color) !important;
+                border-radius: var(--border-radius-lg) !important;
+                padding: 2rem !important;
+                transition: all 0.3s ease !important;
+            }
+            
+            .stFileUploader:hover {
+                border-color: var(--primary-color) !important;
+                background-color: rgba(44, 90, 160, 0.02) !important;
+            }
+            
+            /* Section headers */
+            .section-header {
+                font-family: 'Poppins', sans-serif !important;
+                font-size: 1.8rem !important;
+                font-weight: 600 !important;
+                color: var(--text-primary) !important;
+                margin-bottom: 2rem !important;
+                padding-bottom: 0.5rem !important;
+                border-bottom: 2px solid var(--border-color) !important;
+                position: relative !important;
+            }
+            
+            .section-header::after {
+                content: '' !important;
+                position: absolute !important;
+                bottom: -2px !important;
+                left: 0 !important;
+                width: 60px !important;
+                height: 2px !important;
+                background: linear-gradient(90deg, var(--primary-color), var(--secondary-color)) !important;
+            }
+            
+            /* Animation classes */
+            .fade-in-up {
+                animation: fadeInUp 0.6s ease-out !important;
+            }
+            
+            @keyframes fadeInUp {
+                from {
+                    opacity: 0;
+                    transform: translateY(20px);
+                }
+                to {
+                    opacity: 1;
+                    transform: translateY(0);
+                }
+            }
+            
+            /* Typography improvements */
+            h1, h2, h3, h4, h5, h6 {
+                font-family: 'Poppins', sans-serif !important;
+                color: var(--text-primary) !important;
+                font-weight: 600 !important;
+            }
+            
+            p, li, span, div {
+                font-family: 'Inter', sans-serif !important;
+                color: var(--text-primary) !important;
+                line-height: 1.6 !important;
+            }
+            
+            /* Sidebar recent activities */
+            .activity-row {
+                display: flex;
+                align-items: center;
+                padding: 0.75rem;
+                background-color: var(--light-bg);
+                border-radius: var(--border-radius);
+                margin-bottom: 0.5rem;
+                border-left: 3px solid var(--primary-color);
+                transition: all 0.3s ease;
+                font-family: 'Inter', sans-serif;
+                font-size: 0.85rem;
+                color: var(--text-primary);
+            }
+            .activity-row:hover { background-color: rgba(44, 90, 160, 0.05); }
+            .activity-dot {
+                width: 8px;
+                height: 8px;
+                background-color: var(--secondary-color);
+                border-radius: 50%;
+                margin-right: 0.75rem;
+                flex-shrink: 0;
+            }
+            
+            /* Login page cards */
+            .welcome-card {
+                text-align: center;
+                padding: 3rem 2rem;
+                background: linear-gradient(145deg, #ffffff, #f8fafe);
+                border-radius: 16px;
+                box-shadow: 0 8px 30px rgba(44, 90, 160, 0.15);
+                margin-bottom: 2rem;
+                border: 1px solid rgba(44, 90, 160, 0.08);
+            }
+            .welcome-card .welcome-icon { font-size: 4rem; margin-bottom: 1rem; }
+            .welcome-card h2 {
+                font-family: 'Poppins', sans-serif;
+                font-weight: 700;
+                font-size: 2.2rem;
+                background: linear-gradient(135deg, #2c5aa0, #4a90e2);
+                -webkit-background-clip: text;
+                -webkit-text-fill-color: transparent;
+                background-clip: text;
+                margin-bottom: 0.5rem;
+            }
+            .welcome-card p {
+                font-family: 'Inter', sans-serif;
+                font-size: 1.1rem;
+                color: #636e72;
+                margin-bottom: 0;
+            }
+            .login-title {
+                font-family: 'Poppins', sans-serif;
+                font-weight: 600;
+                color: #2c5aa0;
+                text-align: center;
+                margin-bottom: 1.5rem;
+                font-size: 1.3rem;
+            }
+            .api-card {
+                background: linear-gradient(145deg, #f8fafe, #ffffff);
+                border: 1px solid rgba(116, 185, 255, 0.2);
+                border-radius: 16px;
+                padding: 2rem;
+                margin-top: 1.5rem;
+                box-shadow: 0 2px 10px rgba(116, 185, 255, 0.08);
+            }
+            .api-card h4 {
+                font-family: 'Poppins', sans-serif;
+                font-weight: 600;
+                color: #74b9ff;
+                margin: 0 0 1rem 0;
+                font-size: 1.1rem;
+            }
+            .api-card p {
+                font-family: 'Inter', sans-serif;
+                color: #636e72;
+                font-size: 0.9rem;
+                margin-bottom: 0;
+                line-height: 1.5;
+            }
+            .api-card a { color: #74b9ff; text-decoration: none; }
+            
+            /* Login form */
+            [data-testid="stForm"] .stTextInput > div > div > input {
+                border-radius: 12px !important;
+                border: 2px solid #ddd !important;
+                padding: 0.75rem !important;
+                font-family: 'Inter', sans-serif !important;
+                transition: all 0.3s ease !important;
+                background-color: #ffffff !important;
+            }
+            [data-testid="stForm"] .stTextInput > div > div > input:focus {
+                border-color: #2c5aa0 !important;
+                box-shadow: 0 0 0 3px rgba(44, 90, 160, 0.1) !important;
+            }
+            [data-testid="stForm"] .stButton > button {
+                border-radius: 12px !important;
+                padding: 0.75rem 2rem !important;
+                font-family: 'Inter', sans-serif !important;
+                font-weight: 500 !important;
+                transition: all 0.3s ease !important;
+                border: none !important;
+                box-shadow: 0 2px 10px rgba(44, 90, 160, 0.08) !important;
+            }
+            [data-testid="stForm"] .stButton > button:hover {
+                transform: translateY(-1px) !important;
+                box-shadow: 0 4px 20px rgba(44, 90, 160, 0.15) !important;
+            }
+            [data-testid="stForm"] .stButton > button[kind="primary"] {
+                background: linear-gradient(135deg, #2c5aa0, #4a90e2) !important;
+                color: white !important;
+            }
+            
+            /* API key form */
+            [data-testid="stExpander"] .stTextInput > div > div > input {
+                border-radius: 8px !important;
+                border: 1px solid #ddd !important;
+                font-family: 'Inter', sans-serif !important;
+            }
+            [data-testid="stExpander"] .stButton > button {
+                background: linear-gradient(135deg, #74b9ff, #4a90e2) !important;
+                color: white !important;
+                border-radius: 8px !important;
+                border: none !important;
+                font-family: 'Inter', sans-serif !important;
+                font-weight: 500 !important;
+            }
+            
+            /* Responsive design */
+            @media (max-width: 768px) {
+                .main-header { font-size: 2.5rem !important; }
+            }
+    </style>
+"""
+
+
+# Shared components are built once per process instead of on every rerun
+@st.cache_resource
+def get_security_manager() -> SecurityManager:
+    """Return the process-wide security manager."""
+    return SecurityManager()
+
+
+@st.cache_resource
+def get_memory_store() -> HealthMemoryStore:
+    """Return the process-wide health memory store."""
+    return HealthMemoryStore()
+
+
+@st.cache_resource
+def get_planner() -> HealthAgentPlanner:
+    """Return the process-wide task planner."""
+    return HealthAgentPlanner()
+
+
+@st.cache_resource
+def get_executor(api_key: str) -> "HealthTaskExecutor":
+    """Return the task executor for the given Gemini API key."""
+    from src.agent.executor import HealthTaskExecutor
+    return HealthTaskExecutor(gemini_api_key=api_key, memory_store=get_memory_store())
+
+
+@st.cache_resource
+def get_gemini(api_key: str) -> "GeminiClient":
+    """Return the Gemini client for the given API key."""
+    from src.api.gemini_client import GeminiClient
+    return GeminiClient(api_key)
+
+
+@st.cache_resource
+def get_parser() -> "DocumentParser":
+    """Return the process-wide document parser (probes for Tesseract once)."""
+    from src.utils.document_parser import DocumentParser
+    return DocumentParser()
+
+
+# Modules the first analysis or chat turn needs; see prewarm_imports
+_HEAVY_MODULES = ('src.utils.document_parser', 'src.api.gemini_client')
+
+
+def _import_quietly(names) -> None:
+    """Import each module, leaving failures to surface at first real use."""
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning(f"Background import of {name} failed: {e}")
+
+
+@st.cache_resource(show_spinner=False)
+def prewarm_imports() -> threading.Thread:
+    """Start importing the parser and Gemini stacks off the script thread, once per process."""
+    thread = threading.Thread(target=_import_quietly, args=(_HEAVY_MODULES,), daemon=True)
+    thread.start()
+    return thread
+
+
+def save_upload(uploaded_file) -> Dict[str, Any]:
+    """
+    Writes an upload to temp/, named by a hash of its content.
+    
+    The record is kept in session state by the upload's file_id, so reruns
+    with the same upload skip hashing and copying it again.
+    
+    Args:
+        uploaded_file: File from st.file_uploader
+        
+    Returns:
+        The file's name, type, size, content digest and saved path
+    """
+    saved = st.session_state.setdefault('_saved_uploads', {})
+    record = saved.get(uploaded_file.file_id)
+    if record is not None and record['path'].exists():
+        return record
+    
+    # Keyed by content so re-uploads reuse the existing file
+    digest = hashlib.blake2b(uploaded_file.getbuffer(), digest_size=16).hexdigest()
+    temp_path = Path("temp") / f"{digest}{Path(uploaded_file.name).suffix}"
+    temp_path.parent.mkdir(exist_ok=True)
+    
+    if not temp_path.exists():
+        # Copy in 1 MiB chunks to avoid a second full in-memory copy
+        uploaded_file.seek(0)
+        with open(temp_path, "wb") as f:
+            shutil.copyfileobj(uploaded_file, f, 1 << 20)
+    
+    # Bounded by clearing once it grows too large
+    if len(saved) > 32:
+        saved.clear()
+    saved[uploaded_file.file_id] = record = {
+        'name': uploaded_file.name,
+        'type': uploaded_file.type,
+        'size': uploaded_file.size,
+        'digest': digest,
+        'path': temp_path,
+    }
+    return record
+
+
+# Parsing is memoized by the shared parser itself, keyed on the content-hashed temp
+# path from save_upload. The summary cache lets a document seen before skip the
+# Gemini round-trip. It stays in memory so health records are never written to disk.
+_SUMMARY_CACHE_TTL = 3600
+_SUMMARY_CACHE_SIZE = 50
+
+
+@st.cache_resource
+def _summary_cache() -> Tuple[Dict[Tuple[str, str], Tuple[float, str]], threading.Lock]:
+    """Return the process-wide summary cache, oldest entry first, and its lock."""
+    return {}, threading.Lock()
+
+
+async def summarize_document_cached(api_key: str, prompt: str) -> str:
+    """
+    Generate the AI summary for a document prompt, reusing a recent one.
+    
+    Awaited on the caller's loop; only the finished text is cached, keyed by
+    digests of the API key and prompt so summaries are not shared across keys.
+    
+    Args:
+        api_key: Gemini API key
+        prompt: Analysis prompt
+        
+    Returns:
+        The summary text
+    """
+    cache, lock = _summary_cache()
+    key = (hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest(),
+           hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest())
+    with lock:
+        entry = cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _SUMMARY_CACHE_TTL:
+        return entry[1]
+    
+    summary = await get_gemini(api_key).generate_text(prompt)
+    with lock:
+        cache.pop(key, None)
+        cache[key] = (time.monotonic(), summary)
+        while len(cache) > _SUMMARY_CACHE_SIZE:
+            del cache[next(iter(cache))]
+    return summary
+
+
+@st.cache_resource(show_spinner=False)
+def dependency_status() -> Dict[str, Optional[str]]:
+    """Probe the document parsing dependencies once per process.
+    
+    Returns:
+        Mapping of dependency name to a status string, or None if unavailable
+    """
+    status: Dict[str, Optional[str]] = {}
+    try:
+        import pytesseract
+        status['Tesseract OCR'] = str(pytesseract.get_tesseract_version())
+    except Exception:
+        status['Tesseract OCR'] = None
+    for name, module in (('PyPDF2', 'PyPDF2'),
+                         ('PIL (Image processing)', 'PIL.Image'),
+                         ('python-docx', 'docx')):
+        try:
+            importlib.import_module(module)
+            status[name] = 'Available'
+        except ImportError:
+            status[name] = None
+    return status
+
+
+@contextmanager
+def timed(name: str):
+    """Record the wall-clock time of the block under name in this session's timings."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        st.session_state.setdefault('_timings', deque(maxlen=200)).append(
+            (name, (time.perf_counter_ns() - start) / 1e6)
+        )
+
+
+def timed_section(func):
+    """Decorate a section renderer or async helper so each call is timed."""
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timed(func.__name__):
+                return await func(*args, **kwargs)
+    else:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(func.__name__):
+                return func(*args, **kwargs)
+    return wrapper
+
+
+def timings_summary(timings) -> pd.DataFrame:
+    """Aggregate recorded (stage, ms) timings into per-stage call count, mean and p95."""
+    df = pd.DataFrame(list(timings), columns=['stage', 'ms'])
+    return df.groupby('stage')['ms'].agg(
+        calls='count', mean_ms='mean', p95_ms=lambda ms: ms.quantile(0.95)
+    ).round(1).sort_values('mean_ms', ascending=False)
+
+
+def configured_api_key() -> Optional[str]:
+    """Return the deployment's Gemini API key from Streamlit secrets or the environment."""
+    try:
+        key = st.secrets.get('GEMINI_API_KEY')
+    except FileNotFoundError:
+        key = None
+    return key or os.getenv('GEMINI_API_KEY')
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Thread target: run the loop until stopped, then close it."""
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def _stop_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Ask a loop to stop; its thread then closes it and exits."""
+    try:
+        loop.call_soon_threadsafe(loop.stop)
+    except RuntimeError:
+        pass  # Already closed
+
+
+class _SessionLoop:
+    """Owns a session's event loop thread, stopping it when closed or collected.
+
+    Only session state holds the owner (the loop thread holds the loop
+    itself), so it is collected, and the loop stopped, when Streamlit drops
+    the session's state at session end.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=_run_loop, args=(self.loop,), daemon=True).start()
+        self.close = weakref.finalize(self, _stop_loop, self.loop)
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return this session's long-lived event loop, running on a background thread."""
+    if '_event_loop' not in st.session_state:
+        st.session_state._event_loop = _SessionLoop()
+    return st.session_state._event_loop.loop
+
+
+async def _with_script_ctx(coro, ctx):
+    """Await coro with the caller's script context so st.* calls still render."""
+    add_script_run_ctx(threading.current_thread(), ctx)
+    return await coro
+
+
+def run_async(coro):
+    """Run a coroutine on the session loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(
+        _with_script_ctx(coro, get_script_run_ctx()), get_loop()
+    ).result()
+
+
+async def _load_dashboard_data() -> Dict[str, Any]:
+    """Read the dashboard's independent memory-store queries concurrently."""
+    memory_store = get_memory_store()
+    metrics, trends = await asyncio.gather(
+        memory_store.get_recent_metrics(),
+        memory_store.analyze_trends()
+    )
+    return {'metrics': metrics, 'trends': trends}
+
+
+@st.cache_data(ttl=60)
+def fetch_dashboard_data(user_token: Optional[str]) -> Dict[str, Any]:
+    """Return recent metrics and trends, cached briefly per session token."""
+    return run_async(_load_dashboard_data())
+
+
+@st.cache_resource
+def get_report_template() -> Template:
+    """Return the health report template, built once per process."""
+    return Template(
+        "# $report_type\n\n"
+        "_Generated $generated_at by HIA - Health Insights Agent_\n\n"
+        "$sections\n\n"
+        "---\n"
+        "This report is for information only. Discuss any decisions with your healthcare provider.\n"
+    )
+
+
+def write_report(template: Template, report_type: str, sections: Dict[str, str]) -> str:
+    """Render a report and write it under reports/, returning the file path."""
+    generated_at = datetime.now()
+    body = "\n\n".join(f"## {title}\n\n{text}" for title, text in sections.items())
+    path = Path("reports") / f"health_report_{generated_at.strftime('%Y%m%d_%H%M%S')}.md"
+    path.parent.mkdir(exist_ok=True)
+    path.write_text(template.substitute(
+        report_type=report_type,
+        generated_at=generated_at.strftime('%Y-%m-%d %H:%M'),
+        sections=body or "No sections selected."
+    ), encoding="utf-8")
+    return str(path)
+
+
+# Dashboard metric cards: display name and memory-store metric key
+_DASHBOARD_METRICS = (
+    ("Blood Pressure", "blood_pressure"),
+    ("Glucose", "glucose"),
+    ("Cholesterol", "cholesterol"),
+    ("BMI", "bmi"),
+)
+
+# Shared stand-in for metrics with no reading; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+# Metric status to card icon and label
+_STATUS_MAPPING = {
+    'normal': {'icon': '✅', 'label': 'Normal'},
+    'good': {'icon': '💙', 'label': 'Good'},
+    'warning': {'icon': '⚠️', 'label': 'Attention'},
+    'critical': {'icon': '🚨', 'label': 'Critical'},
+    'unknown': {'icon': '❓', 'label': 'No Data'}
+}
+
+# Dashboard list item markup; each list is joined and sent as one element
+_INSIGHT_TMPL = """
+<div class="{card_class}">
+    <div style="display: flex; align-items: flex-start; gap: 1rem;">
+        <div style="font-size: 1.5rem; flex-shrink: 0;">{icon}</div>
+        <div style="flex: 1;">
+            <p style="margin: 0; line-height: 1.6; font-family: 'Inter', sans-serif; font-size: 0.95rem;">
+                {text}
+            </p>
+        </div>
+    </div>
+</div>
+"""
+
+# Sample appointments shown until scheduling exists
+_UPCOMING_ITEMS = (
+    {"icon": "🗓️", "text": "Annual check-up", "date": "Feb 15"},
+    {"icon": "💉", "text": "Flu vaccine", "date": "Oct 1"},
+    {"icon": "🦷", "text": "Dental cleaning", "date": "Mar 20"},
+)
+
+_UPCOMING_TMPL = """
+<div style="display: flex; align-items: center; padding: 0.75rem; background-color: var(--light-bg);
+           border-radius: var(--border-radius); margin-bottom: 0.5rem; transition: all 0.3s ease;">
+    <span style="font-size: 1.2rem; margin-right: 1rem;">{icon}</span>
+    <div style="flex: 1;">
+        <div style="font-weight: 500; color: var(--text-primary);">{text}</div>
+        <div style="font-size: 0.8rem; color: var(--text-secondary);">{date}</div>
+    </div>
+</div>
+"""
+
+# Main sections and the HIAStreamlitApp method that renders each
+_SECTIONS = {
+    "📊 Dashboard": "show_dashboard",
+    "📄 Document Analysis": "show_document_analysis",
+    "💬 Health Q&A": "show_health_qa",
+    "📈 Trends & Insights": "show_trends",
+    "⚕️ Reports": "show_reports",
+}
+_SECTION_LABELS = tuple(_SECTIONS)
+
+# Static login page markup
+_WELCOME_HTML = """
+<div class="welcome-card">
+    <div class="welcome-icon">🏥</div>
+    <h2>Welcome to HIA</h2>
+    <p>Your personal AI health analyst</p>
+</div>
+"""
+
+_LOGIN_TITLE_HTML = '<h3 class="login-title">🔐 Sign In to Continue</h3>'
+
+_API_CARD_HTML = """
+<div class="api-card">
+    <h4>🔑 Setup Gemini API Key</h4>
+    <p>
+        To use the AI analysis features, please provide your Google Gemini API key.
+        <a href="https://makersuite.google.com/app/apikey" target="_blank">Get your API key here →</a>
+    </p>
+</div>
+"""
+
+# Static sidebar markup, emitted as single elements
+_SIDEBAR_HEADER_HTML = """
+<div style="
+    background: linear-gradient(135deg, var(--primary-color), var(--primary-light));
+    color: white;
+    padding: 1.5rem;
+    border-radius: var(--border-radius-lg);
+    margin-bottom: 2rem;
+    text-align: center;
+    box-shadow: var(--shadow-medium);
+">
+    <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">👤</div>
+    <div style="font-family: 'Poppins', sans-serif; font-weight: 600; font-size: 1.1rem; margin-bottom: 0.25rem;">
+        Health Dashboard
+    </div>
+    <div style="font-size: 0.9rem; opacity: 0.9; font-family: 'Inter', sans-serif;">
+        Session Active
+    </div>
+</div>
+<div class="section-header" style="font-size: 1.1rem; margin-bottom: 1.5rem;">⚡ Quick Actions</div>
+<h4>Quick Upload</h4>
+"""
+
+_ACTIVITIES_HEADER_HTML = (
+    '<div class="section-header" style="font-size: 1.1rem; margin: 2rem 0 1.5rem 0;">'
+    '📋 Recent Activities</div>\n'
+)
+
+# Sample activity feed shown until real activity is recorded
+_DEFAULT_ACTIVITIES = (
+    "Document analyzed - Lab Report.pdf",
+    "Health score updated - 85/100",
+    "Recommendation generated",
+    "Metrics synchronized",
+    "Report generated",
+)
+
+
+@st.cache_data(show_spinner=False)
+def format_activities_html(activities: tuple) -> str:
+    """Build the sidebar Recent Activities block for the given activities."""
+    return _ACTIVITIES_HEADER_HTML + "\n".join(
+        f'<div class="activity-row"><span class="activity-dot"></span>{activity}</div>'
+        for activity in activities
+    )
+
+
+# Sample report history shown until report storage exists
+_RECENT_REPORTS = (
+    {"date": "2024-01-15", "type": "Annual Summary", "id": "rep_001"},
+    {"date": "2024-01-08", "type": "Lab Results", "id": "rep_002"},
+    {"date": "2023-12-20", "type": "Doctor Visit", "id": "rep_003"},
+)
+
+_TREND_PERIODS = {
+    "Last Week": "week",
+    "Last Month": "month",
+    "Last Quarter": "quarter",
+    "Last Year": "year",
+    "All Time": "all",
+}
+
+
+@st.cache_data(ttl=60)
+def fetch_metrics_df(user_token: Optional[str], time_range: str) -> pd.DataFrame:
+    """Return numeric metric history as one wide frame: a column per metric, indexed by time."""
+    history = run_async(get_memory_store().get_historical_metrics(
+        ['all'], _TREND_PERIODS.get(time_range, 'all')
+    ))
+    records = pd.DataFrame(
+        [(name, row['timestamp'], row['value']) for name, rows in history.items() for row in rows],
+        columns=['metric', 'timestamp', 'value']
+    )
+    records['timestamp'] = pd.to_datetime(records['timestamp'])
+    records['value'] = pd.to_numeric(records['value'], errors='coerce')
+    wide = records.pivot_table(index='timestamp', columns='metric', values='value', aggfunc='last')
+    return wide.dropna(axis=1, how='all')
+
+
+def downsample(df: pd.DataFrame, n: int = 500) -> pd.DataFrame:
+    """
+    Thins a wide time-series frame to about n points per column with LTTB.
+    
+    Args:
+        df: Frame indexed by timestamp with one numeric column per series
+        n: Points to keep for each column
+        
+    Returns:
+        The rows of df that any column's downsampled series keeps
+    """
+    if len(df) <= n:
+        return df
+    
+    keep = set()
+    for col in df.columns:
+        series = df[col].dropna()
+        positions = lttb_indices(series.index.values, series.values, n)
+        keep.update(series.index[positions])
+    return df.loc[df.index.isin(keep)]
+
+
+# Fields DocumentParser emits for each extracted value
+_VALUE_COLUMNS = ['test_name', 'value', 'unit']
+
+
+# Chat context lookups remembered per session before the oldest is evicted
+_CONTEXT_CACHE_SIZE = 32
+
+
+def format_chat_markdown(messages: List[Dict[str, Any]]) -> str:
+    """Render chat history entries as one markdown document."""
+    return "\n\n---\n\n".join(
+        f"**{'You' if m['role'] == 'user' else 'HIA'}:** {m['content']}\n\n"
+        f":gray[{m['timestamp']:%I:%M %p}]"
+        for m in messages
+    )
+
+
+@st.cache_data
+def values_dataframe(values: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the extracted-values table for one analysis result."""
+    return pd.DataFrame(values, columns=_VALUE_COLUMNS)
 
 
 class HIAStreamlitApp:
@@ -37,324 +920,34 @@ class HIAStreamlitApp:
     
     def initialize_session_state(self):
         """Initialize session state variables."""
-        if 'initialized' not in st.session_state:
-            st.session_state.initialized = True
-            st.session_state.authenticated = False
-            st.session_state.session_token = None
-            st.session_state.chat_history = []
-            st.session_state.uploaded_files = []
-            st.session_state.current_metrics = {}
-            st.session_state.analysis_results = []
-            st.session_state.css_loaded = False  # Track CSS loading
+        ss = st.session_state
+        ss.setdefault('authenticated', False)
+        ss.setdefault('session_token', None)
+        # History is bounded so long sessions do not grow state without limit
+        ss.setdefault('chat_history', deque(maxlen=200))
+        ss.setdefault('uploaded_files', [])
+        ss.setdefault('current_metrics', {})
+        ss.setdefault('analysis_results', deque(maxlen=50))
     
     def inject_custom_css(self):
-        """Inject custom CSS with cache busting and persistent loading."""
-        # Force reload CSS on every run by using timestamp
-        cache_buster = datetime.now().timestamp()
-        st.markdown(f"""
-        <style id="hia-custom-styles-{cache_buster}">
-            /* HIA Custom Styles - Cache buster: {cache_buster} */
-            /* If styles revert after reload, press Ctrl+F5 (Windows) or Cmd+Shift+R (Mac) to hard refresh */
-            
-            /* Import modern fonts with cache busting */
-            @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Poppins:wght@300;400;500;600;700&display=swap&v={cache_buster}');
-                
-                /* Root variables for consistent theming */
-                :root {{
-                    --primary-color: #2c5aa0;
-                    --primary-light: #4a90e2;
-                    --primary-dark: #1e3d73;
-                    --secondary-color: #00b894;
-                    --secondary-light: #26d0ce;
-                    --warning-color: #fd79a8;
-                    --danger-color: #e17055;
-                    --success-color: #00b894;
-                    --info-color: #74b9ff;
-                    --light-bg: #f8fafe;
-                    --card-bg: #ffffff;
-                    --text-primary: #2d3436;
-                    --text-secondary: #636e72;
-                    --text-light: #b2bec3;
-                    --border-color: #ddd;
-                    --shadow-light: 0 2px 10px rgba(44, 90, 160, 0.08);
-                    --shadow-medium: 0 4px 20px rgba(44, 90, 160, 0.12);
-                    --shadow-heavy: 0 8px 30px rgba(44, 90, 160, 0.15);
-                    --border-radius: 12px;
-                    --border-radius-lg: 16px;
-                }}
-                
-                /* Force override Streamlit defaults */
-                .main .block-container {{
-                    padding-top: 2rem !important;
-                    padding-bottom: 2rem !important;
-                    max-width: 1400px !important;
-                }}
-                
-                /* Hide Streamlit elements */
-                #MainMenu {{visibility: hidden !important;}}
-                footer {{visibility: hidden !important;}}
-                header {{visibility: hidden !important;}}
-                .stDeployButton {{display: none !important;}}
-                
-                /* Main header styling */
-                .main-header {{
-                    font-family: 'Poppins', sans-serif !important;
-                    font-size: 3.5rem !important;
-                    font-weight: 700 !important;
-                    background: linear-gradient(135deg, var(--primary-color), var(--primary-light)) !important;
-                    -webkit-background-clip: text !important;
-                    -webkit-text-fill-color: transparent !important;
-                    background-clip: text !important;
-                    text-align: center !important;
-                    margin-bottom: 3rem !important;
-                    letter-spacing: -0.02em !important;
-                }}
-                
-                /* Enhanced metric cards */
-                .metric-card {{
-                    background: linear-gradient(145deg, #ffffff, #f8fafe) !important;
-                    padding: 2rem !important;
-                    border-radius: var(--border-radius-lg) !important;
-                    box-shadow: var(--shadow-medium) !important;
-                    margin-bottom: 1.5rem !important;
-                    border: 1px solid rgba(44, 90, 160, 0.08) !important;
-                    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-                    position: relative !important;
-                    overflow: hidden !important;
-                }}
-                
-                .metric-card::before {{
-                    content: '' !important;
-                    position: absolute !important;
-                    top: 0 !important;
-                    left: 0 !important;
-                    right: 0 !important;
-                    height: 4px !important;
-                    background: linear-gradient(90deg, var(--primary-color), var(--secondary-color)) !important;
-                }}
-                
-                .metric-card:hover {{
-                    transform: translateY(-4px) !important;
-                    box-shadow: var(--shadow-heavy) !important;
-                }}
-                
-                .metric-card h4 {{
-                    font-family: 'Inter', sans-serif !important;
-                    font-size: 0.9rem !important;
-                    font-weight: 600 !important;
-                    color: var(--text-secondary) !important;
-                    margin-bottom: 1rem !important;
-                    text-transform: uppercase !important;
-                    letter-spacing: 0.05em !important;
-                }}
-                
-                .metric-card .metric-value {{
-                    font-family: 'Poppins', sans-serif !important;
-                    font-size: 2.2rem !important;
-                    font-weight: 700 !important;
-                    margin-bottom: 0.5rem !important;
-                    line-height: 1 !important;
-                }}
-                
-                /* Health score colors */
-                .health-score-excellent {{ color: var(--success-color) !important; }}
-                .health-score-good {{ color: var(--info-color) !important; }}
-                .health-score-warning {{ color: var(--warning-color) !important; }}
-                .health-score-critical {{ color: var(--danger-color) !important; }}
-                .health-score-unknown {{ color: var(--text-light) !important; }}
-                
-                /* Enhanced buttons */
-                .stButton > button {{
-                    font-family: 'Inter', sans-serif !important;
-                    font-weight: 500 !important;
-                    border-radius: var(--border-radius) !important;
-                    border: none !important;
-                    padding: 0.75rem 2rem !important;
-                    transition: all 0.3s ease !important;
-                    box-shadow: var(--shadow-light) !important;
-                }}
-                
-                .stButton > button:hover {{
-                    transform: translateY(-1px) !important;
-                    box-shadow: var(--shadow-medium) !important;
-                }}
-                
-                .stButton > button[kind="primary"], .stButton > button[type="primary"] {{
-                    background: linear-gradient(135deg, var(--primary-color), var(--primary-light)) !important;
-                    color: white !important;
-                }}
-                
-                /* Form styling */
-                .stTextInput > div > div > input,
-                .stTextArea > div > div > textarea,
-                .stSelectbox > div > div > select {{
-                    border-radius: var(--border-radius) !important;
-                    border: 2px solid var(--border-color) !important;
-                    padding: 0.75rem !important;
-                    font-family: 'Inter', sans-serif !important;
-                    transition: border-color 0.3s ease, box-shadow 0.3s ease !important;
-                    background-color: white !important;
-                }}
-                
-                .stTextInput > div > div > input:focus,
-                .stTextArea > div > div > textarea:focus,
-                .stSelectbox > div > div > select:focus {{
-                    border-color: var(--primary-color) !important;
-                    box-shadow: 0 0 0 3px rgba(44, 90, 160, 0.1) !important;
-                    outline: none !important;
-                }}
-                
-                /* Tab styling */
-                .stTabs [data-baseweb="tab-list"] {{
-                    gap: 1rem !important;
-                    background-color: transparent !important;
-                    border-bottom: 2px solid var(--border-color) !important;
-                }}
-                
-                .stTabs [data-baseweb="tab"] {{
-                    height: 3rem !important;
-                    padding: 0 1.5rem !important;
-                    border-radius: var(--border-radius) var(--border-radius) 0 0 !important;
-                    font-family: 'Inter', sans-serif !important;
-                    font-weight: 500 !important;
-                    color: var(--text-secondary) !important;
-                    background-color: transparent !important;
-                    border: none !important;
-                    transition: all 0.3s ease !important;
-                }}
-                
-                .stTabs [aria-selected="true"] {{
-                    background-color: var(--primary-color) !important;
-                    color: white !important;
-                    box-shadow: var(--shadow-light) !important;
-                }}
-                
-                /* Sidebar styling */
-                .css-1d391kg {{
-                    background: linear-gradient(180deg, var(--light-bg), #ffffff) !important;
-                    border-right: 1px solid var(--border-color) !important;
-                }}
-                
-                /* Info cards */
-                .info-card {{
-                    background: linear-gradient(145deg, #ffffff, #f8fafe) !important;
-                    border: 1px solid rgba(44, 90, 160, 0.08) !important;
-                    border-left: 4px solid var(--info-color) !important;
-                    border-radius: var(--border-radius) !important;
-                    padding: 1.5rem !important;
-                    margin-bottom: 1.5rem !important;
-                    box-shadow: var(--shadow-light) !important;
-                    transition: all 0.3s ease !important;
-                }}
-                
-                .info-card:hover {{ box-shadow: var(--shadow-medium) !important; }}
-                .warning-card {{ border-left-color: var(--warning-color) !important; background: linear-gradient(145deg, #fff8f0, #ffffff) !important; }}
-                .success-card {{ border-left-color: var(--success-color) !important; background: linear-gradient(145deg, #f0fff8, #ffffff) !important; }}
-                .error-card {{ border-left-color: var(--danger-color) !important; background: linear-gradient(145deg, #fff0f0, #ffffff) !important; }}
-                
-                /* Progress bars */
-                .stProgress > div > div > div > div {{
-                    background: linear-gradient(90deg, var(--primary-color), var(--secondary-color)) !important;
-                    border-radius: 10px !important;
-                }}
-                
-                /* File uploader styling */
-                .stFileUploader {{
-                    background-color: var(--light-bg) !important;
-                    border: 2px dashed var(--border-color) !important;
-                    border-radius: var(--border-radius-lg) !important;
-                    padding: 2rem !important;
-                    transition: all 0.3s ease !important;
-                }}
-                
-                .stFileUploader:hover {{
-                    border-color: var(--primary-color) !important;
-                    background-color: rgba(44, 90, 160, 0.02) !important;
-                }}
-                
-                /* Section headers */
-                .section-header {{
-                    font-family: 'Poppins', sans-serif !important;
-                    font-size: 1.8rem !important;
-                    font-weight: 600 !important;
-                    color: var(--text-primary) !important;
-                    margin-bottom: 2rem !important;
-                    padding-bottom: 0.5rem !important;
-                    border-bottom: 2px solid var(--border-color) !important;
-                    position: relative !important;
-                }}
-                
-                .section-header::after {{
-                    content: '' !important;
-                    position: absolute !important;
-                    bottom: -2px !important;
-                    left: 0 !important;
-                    width: 60px !important;
-                    height: 2px !important;
-                    background: linear-gradient(90deg, var(--primary-color), var(--secondary-color)) !important;
-                }}
-                
-                /* Animation classes */
-                .fade-in-up {{
-                    animation: fadeInUp 0.6s ease-out !important;
-                }}
-                
-                @keyframes fadeInUp {{
-                    from {{
-                        opacity: 0;
-                        transform: translateY(20px);
-                    }}
-                    to {{
-                        opacity: 1;
-                        transform: translateY(0);
-                    }}
-                }}
-                
-                /* Typography improvements */
-                h1, h2, h3, h4, h5, h6 {{
-                    font-family: 'Poppins', sans-serif !important;
-                    color: var(--text-primary) !important;
-                    font-weight: 600 !important;
-                }}
-                
-                p, li, span, div {{
-                    font-family: 'Inter', sans-serif !important;
-                    color: var(--text-primary) !important;
-                    line-height: 1.6 !important;
-                }}
-                
-                /* Responsive design */
-                @media (max-width: 768px) {{
-                    .main-header {{ font-size: 2.5rem !important; }}
-                    .metric-card {{ margin-bottom: 1rem !important; }}
-                }}
-        </style>
-        """, unsafe_allow_html=True)
-        
-        # Also inject a small script to force style refresh
-        st.markdown(f"""
-        <script>
-            // Force refresh styles - cache buster: {cache_buster}
-            if (typeof window.hia_styles_loaded === 'undefined') {{
-                window.hia_styles_loaded = true;
-                console.log('HIA Custom Styles Loaded - Version: {cache_buster}');
-            }}
-        </script>
-        """, unsafe_allow_html=True)
+        """Inject the page and component stylesheets, once per script run."""
+        st.markdown(_HIA_CSS, unsafe_allow_html=True)
+        HIAComponents.inject_css()
     
     def setup_components(self):
         """Setup HIA components."""
-        # Get API key from environment or user input
-        self.gemini_api_key = os.getenv('GEMINI_API_KEY')
+        # A key entered in this session wins over the deployment-wide one
+        self.gemini_api_key = st.session_state.get('gemini_api_key') or configured_api_key()
         
         # Initialize components
         try:
-            self.security_manager = SecurityManager()
-            self.memory_store = HealthMemoryStore()
-            self.planner = HealthAgentPlanner()
+            prewarm_imports()
+            self.security_manager = get_security_manager()
+            self.memory_store = get_memory_store()
+            self.planner = get_planner()
             
             if self.gemini_api_key:
-                self.executor = HealthTaskExecutor(gemini_api_key=self.gemini_api_key)
+                self.executor = get_executor(self.gemini_api_key)
             else:
                 self.executor = None
         except Exception as e:
@@ -382,204 +975,45 @@ class HIAStreamlitApp:
         
         with col2:
             # Modern welcome section with enhanced styling
-            st.markdown("""
-            <div style="
-                text-align: center;
-                padding: 3rem 2rem;
-                background: linear-gradient(145deg, #ffffff, #f8fafe);
-                border-radius: 16px;
-                box-shadow: 0 8px 30px rgba(44, 90, 160, 0.15);
-                margin-bottom: 2rem;
-                border: 1px solid rgba(44, 90, 160, 0.08);
-            ">
-                <div style="font-size: 4rem; margin-bottom: 1rem;">🏥</div>
-                <h2 style="
-                    font-family: 'Poppins', sans-serif;
-                    font-weight: 700;
-                    font-size: 2.2rem;
-                    background: linear-gradient(135deg, #2c5aa0, #4a90e2);
-                    -webkit-background-clip: text;
-                    -webkit-text-fill-color: transparent;
-                    background-clip: text;
-                    margin-bottom: 0.5rem;
-                ">
-                    Welcome to HIA
-                </h2>
-                <p style="
-                    font-family: 'Inter', sans-serif;
-                    font-size: 1.1rem;
-                    color: #636e72;
-                    margin-bottom: 0;
-                ">
-                    Your personal AI health analyst
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Enhanced login form container
-            st.markdown("""
-            <div style="
-                background: linear-gradient(145deg, #ffffff, #f8fafe);
-                border-radius: 16px;
-                padding: 2.5rem;
-                box-shadow: 0 4px 20px rgba(44, 90, 160, 0.12);
-                border: 1px solid rgba(44, 90, 160, 0.08);
-                margin-bottom: 2rem;
-            ">
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-            <style>
-                .login-form .stTextInput > div > div > input {
-                    border-radius: 12px !important;
-                    border: 2px solid #ddd !important;
-                    padding: 0.75rem !important;
-                    font-family: 'Inter', sans-serif !important;
-                    transition: all 0.3s ease !important;
-                    background-color: #ffffff !important;
-                }
-                .login-form .stTextInput > div > div > input:focus {
-                    border-color: #2c5aa0 !important;
-                    box-shadow: 0 0 0 3px rgba(44, 90, 160, 0.1) !important;
-                }
-                .login-form .stButton > button {
-                    border-radius: 12px !important;
-                    padding: 0.75rem 2rem !important;
-                    font-family: 'Inter', sans-serif !important;
-                    font-weight: 500 !important;
-                    transition: all 0.3s ease !important;
-                    border: none !important;
-                    box-shadow: 0 2px 10px rgba(44, 90, 160, 0.08) !important;
-                }
-                .login-form .stButton > button:hover {
-                    transform: translateY(-1px) !important;
-                    box-shadow: 0 4px 20px rgba(44, 90, 160, 0.15) !important;
-                }
-                .login-form .stButton > button[kind="primary"] {
-                    background: linear-gradient(135deg, #2c5aa0, #4a90e2) !important;
-                    color: white !important;
-                }
-            </style>
-            """, unsafe_allow_html=True)
+            st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
             
             # Simple authentication (in production, use proper auth)
             with st.form("login_form", clear_on_submit=False):
-                st.markdown('<div class="login-form">', unsafe_allow_html=True)
+                st.markdown(_LOGIN_TITLE_HTML, unsafe_allow_html=True)
                 
-                st.markdown("""
-                <h3 style="
-                    font-family: 'Poppins', sans-serif;
-                    font-weight: 600;
-                    color: #2c5aa0;
-                    text-align: center;
-                    margin-bottom: 1.5rem;
-                    font-size: 1.3rem;
-                ">
-                    🔐 Sign In to Continue
-                </h3>
-                """, unsafe_allow_html=True)
-                
-                username = st.text_input("👤 Username", placeholder="Enter your username", key="login_username")
-                password = st.text_input("🔒 Password", type="password", 
-                                       placeholder="Enter your password", key="login_password")
+                st.text_input("👤 Username", placeholder="Enter your username", key="login_username")
+                st.text_input("🔒 Password", type="password", 
+                              placeholder="Enter your password", key="login_password")
                 
                 st.markdown("<br>", unsafe_allow_html=True)
                 
                 col1, col2 = st.columns(2)
                 with col1:
-                    login_button = st.form_submit_button("🚀 Login", use_container_width=True, type="primary")
+                    login_button = st.form_submit_button("🚀 Login", use_container_width=True, type="primary",
+                                                         on_click=self._login)
                 with col2:
-                    demo_button = st.form_submit_button("🎯 Try Demo", use_container_width=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-                if login_button:
-                    # Validate credentials (simplified for demo)
-                    if username and password:
-                        st.session_state.authenticated = True
-                        st.session_state.session_token = self.security_manager.create_session(username)
-                        st.rerun()
-                    else:
-                        st.error("Please enter both username and password")
+                    st.form_submit_button("🎯 Try Demo", use_container_width=True,
+                                          on_click=self._login, kwargs={'demo': True})
                 
-                if demo_button:
-                    st.session_state.authenticated = True
-                    st.session_state.session_token = self.security_manager.create_session("demo_user")
-                    st.rerun()
-            
-            st.markdown('</div>', unsafe_allow_html=True)  # Close login form container
+                # Successful logins are handled in _login before this rerun starts
+                if login_button and not st.session_state.authenticated:
+                    st.error("Please enter both username and password")
             
             # Enhanced API Key setup
-            st.markdown("""
-            <div style="
-                background: linear-gradient(145deg, #f8fafe, #ffffff);
-                border: 1px solid rgba(116, 185, 255, 0.2);
-                border-radius: 16px;
-                padding: 2rem;
-                margin-top: 1.5rem;
-                box-shadow: 0 2px 10px rgba(116, 185, 255, 0.08);
-            ">
-                <div style="display: flex; align-items: center; margin-bottom: 1rem;">
-                    <div style="font-size: 1.5rem; margin-right: 0.75rem;">🔑</div>
-                    <h4 style="
-                        font-family: 'Poppins', sans-serif;
-                        font-weight: 600;
-                        color: #74b9ff;
-                        margin: 0;
-                        font-size: 1.1rem;
-                    ">
-                        Setup Gemini API Key
-                    </h4>
-                </div>
-                <p style="
-                    font-family: 'Inter', sans-serif;
-                    color: #636e72;
-                    font-size: 0.9rem;
-                    margin-bottom: 1.5rem;
-                    line-height: 1.5;
-                ">
-                    To use the AI analysis features, please provide your Google Gemini API key.
-                    <a href="https://makersuite.google.com/app/apikey" target="_blank" style="color: #74b9ff; text-decoration: none;">
-                        Get your API key here →
-                    </a>
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_API_CARD_HTML, unsafe_allow_html=True)
             
             with st.expander("🔑 Configure API Key", expanded=False):
-                st.markdown("""
-                <style>
-                    .api-form .stTextInput > div > div > input {
-                        border-radius: 8px !important;
-                        border: 1px solid #ddd !important;
-                        font-family: 'Inter', sans-serif !important;
-                    }
-                    .api-form .stButton > button {
-                        background: linear-gradient(135deg, #74b9ff, #4a90e2) !important;
-                        color: white !important;
-                        border-radius: 8px !important;
-                        border: none !important;
-                        font-family: 'Inter', sans-serif !important;
-                        font-weight: 500 !important;
-                    }
-                </style>
-                """, unsafe_allow_html=True)
-                
-                st.markdown('<div class="api-form">', unsafe_allow_html=True)
                 api_key = st.text_input("🔐 Gemini API Key", type="password",
                                       help="Enter your Google Gemini API key", 
                                       placeholder="Enter your API key...")
                 if st.button("💾 Save API Key", use_container_width=True):
                     if api_key:
-                        os.environ['GEMINI_API_KEY'] = api_key
-                        st.session_state.api_key_updated = True
+                        # Kept per session; the executor factory is keyed on the key itself
+                        st.session_state.gemini_api_key = api_key
                         st.success("✅ API Key saved! Please click 'Try Demo' to continue.")
-                        # Reinitialize components with new API key
-                        self.gemini_api_key = api_key
                         self.setup_components()
                     else:
                         st.error("❌ Please enter a valid API key")
-                st.markdown('</div>', unsafe_allow_html=True)
     
     def show_main_app(self):
         """Show main application interface."""
@@ -587,58 +1021,15 @@ class HIAStreamlitApp:
         with st.sidebar:
             self.show_sidebar()
         
-        # Main content area with tabs
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
-            "📊 Dashboard", 
-            "📄 Document Analysis", 
-            "💬 Health Q&A", 
-            "📈 Trends & Insights",
-            "⚕️ Reports"
-        ])
-        
-        with tab1:
-            self.show_dashboard()
-        
-        with tab2:
-            self.show_document_analysis()
-        
-        with tab3:
-            self.show_health_qa()
-        
-        with tab4:
-            self.show_trends()
-        
-        with tab5:
-            self.show_reports()
+        # Main content area; only the selected section is rendered on each rerun
+        active = st.radio("Section", _SECTION_LABELS, horizontal=True,
+                          key="active_tab", label_visibility="collapsed")
+        getattr(self, _SECTIONS[active])()
     
     def show_sidebar(self):
         """Show sidebar with user info and settings."""
-        # User profile section with modern styling
-        st.markdown("""
-        <div style="
-            background: linear-gradient(135deg, var(--primary-color), var(--primary-light));
-            color: white;
-            padding: 1.5rem;
-            border-radius: var(--border-radius-lg);
-            margin-bottom: 2rem;
-            text-align: center;
-            box-shadow: var(--shadow-medium);
-        ">
-            <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">👤</div>
-            <div style="font-family: 'Poppins', sans-serif; font-weight: 600; font-size: 1.1rem; margin-bottom: 0.25rem;">
-                Health Dashboard
-            </div>
-            <div style="font-size: 0.9rem; opacity: 0.9; font-family: 'Inter', sans-serif;">
-                Session Active
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Quick actions
-        st.markdown('<div class="section-header" style="font-size: 1.1rem; margin-bottom: 1.5rem;">⚡ Quick Actions</div>', unsafe_allow_html=True)
-        
-        # Quick upload section
-        st.markdown("#### Quick Upload")
+        # User profile, quick actions heading and upload label in one element
+        st.markdown(_SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
         uploaded_file = st.file_uploader(
             "Upload Document",
             type=['pdf', 'png', 'jpg', 'jpeg', 'docx', 'txt'],
@@ -646,99 +1037,93 @@ class HIAStreamlitApp:
         )
         
         if uploaded_file:
-            if st.button("🔍 Analyze", use_container_width=True):
-                # Save to session state to process in main area
-                st.session_state.pending_file = uploaded_file
+            # Save to session state to process in main area
+            if st.button("🔍 Analyze", use_container_width=True,
+                         on_click=self._queue_sidebar_upload):
                 st.info("Switch to Document Analysis tab to see results")
         
         # Recent activities
-        st.markdown('<div class="section-header" style="font-size: 1.1rem; margin: 2rem 0 1.5rem 0;">📋 Recent Activities</div>', unsafe_allow_html=True)
-        activities = st.session_state.get('recent_activities', [
-            "Document analyzed - Lab Report.pdf",
-            "Health score updated - 85/100",
-            "Recommendation generated",
-            "Metrics synchronized",
-            "Report generated"
-        ])
-        
-        for i, activity in enumerate(activities[-5:]):
-            st.markdown(f"""
-            <div style="
-                display: flex;
-                align-items: center;
-                padding: 0.75rem;
-                background-color: var(--light-bg);
-                border-radius: var(--border-radius);
-                margin-bottom: 0.5rem;
-                border-left: 3px solid var(--primary-color);
-                transition: all 0.3s ease;
-            " onmouseover="this.style.backgroundColor='rgba(44, 90, 160, 0.05)'"
-               onmouseout="this.style.backgroundColor='var(--light-bg)'">
-                <div style="
-                    width: 8px;
-                    height: 8px;
-                    background-color: var(--secondary-color);
-                    border-radius: 50%;
-                    margin-right: 0.75rem;
-                "></div>
-                <div style="
-                    font-family: 'Inter', sans-serif;
-                    font-size: 0.85rem;
-                    color: var(--text-primary);
-                ">
-                    {activity}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        activities = st.session_state.get('recent_activities', _DEFAULT_ACTIVITIES)
+        st.markdown(format_activities_html(tuple(activities[-5:])), unsafe_allow_html=True)
         
         # Settings
         with st.expander("⚙️ Settings"):
             st.selectbox("Language", ["English", "Spanish", "French", "Chinese"])
             st.selectbox("Units", ["Metric", "Imperial"])
             st.checkbox("Enable notifications")
+            st.checkbox("Show debugging details", key="debug_mode",
+                        help="Show file, dependency and traceback details when analysis fails")
+            if st.session_state.get('debug_mode') and st.session_state.get('_timings'):
+                st.caption("Section timings (ms)")
+                st.dataframe(timings_summary(st.session_state._timings), use_container_width=True)
         
         # Logout
-        if st.button("🚪 Logout", use_container_width=True):
-            st.session_state.authenticated = False
-            st.session_state.session_token = None
-            st.rerun()
+        st.button("🚪 Logout", use_container_width=True, on_click=self._logout)
+    
+    def _login(self, demo: bool = False):
+        """Authenticate from the login form before the triggered rerun runs."""
+        username = "demo_user" if demo else st.session_state.get('login_username')
+        # Validate credentials (simplified for demo)
+        if demo or (username and st.session_state.get('login_password')):
+            self._update_state(authenticated=True,
+                               session_token=self.security_manager.create_session(username))
+    
+    def _logout(self):
+        """End the session in the shared security manager and reset auth state."""
+        if st.session_state.session_token:
+            self.security_manager.end_session(st.session_state.session_token)
+        session_loop = st.session_state.pop('_event_loop', None)
+        if session_loop is not None:
+            session_loop.close()
+        self._update_state(authenticated=False, session_token=None)
+    
+    @staticmethod
+    def _queue_sidebar_upload():
+        """Save the sidebar upload to disk and hand its path to the analysis tab."""
+        uploaded_file = st.session_state.get('sidebar_upload')
+        if uploaded_file:
+            st.session_state.pending_upload = save_upload(uploaded_file)
     
+    @staticmethod
+    def _update_state(**updates):
+        """Apply a batch of session-state updates from a widget callback."""
+        st.session_state.update(updates)
+    
+    @st.fragment
+    @timed_section
     def show_dashboard(self):
         """Show main dashboard with health overview."""
         st.markdown('<div class="section-header">🩺 Health Overview</div>', unsafe_allow_html=True)
         
-        # Fetch recent metrics
-        asyncio.run(self._update_dashboard_metrics())
-        
-        # Display metrics in cards
-        col1, col2, col3, col4 = st.columns(4)
+        # Fetch recent metrics and trends
+        trends = {}
+        try:
+            data = fetch_dashboard_data(st.session_state.session_token)
+            st.session_state.current_metrics = data['metrics']
+            trends = data['trends']
+        except Exception as e:
+            st.error(f"Error loading metrics: {str(e)}")
         
+        # Display metrics in cards; st.metric lets Streamlit send only changed values
         metrics = st.session_state.current_metrics
         
-        with col1:
-            self._show_metric_card("Blood Pressure", 
-                                 metrics.get('blood_pressure', {}).get('value', 'N/A'),
-                                 metrics.get('blood_pressure', {}).get('status', 'unknown'))
-        
-        with col2:
-            self._show_metric_card("Glucose", 
-                                 metrics.get('glucose', {}).get('value', 'N/A'),
-                                 metrics.get('glucose', {}).get('status', 'unknown'))
-        
-        with col3:
-            self._show_metric_card("Cholesterol", 
-                                 metrics.get('cholesterol', {}).get('value', 'N/A'),
-                                 metrics.get('cholesterol', {}).get('status', 'unknown'))
-        
-        with col4:
-            self._show_metric_card("BMI", 
-                                 metrics.get('bmi', {}).get('value', 'N/A'),
-                                 metrics.get('bmi', {}).get('status', 'unknown'))
+        for col, (name, key) in zip(st.columns(len(_DASHBOARD_METRICS)), _DASHBOARD_METRICS):
+            with col:
+                data = metrics.get(key) or _EMPTY
+                self._show_metric_card(name, data.get('value', 'N/A'), data.get('status', 'unknown'))
         
         # Health insights
         st.markdown('<div class="section-header" style="font-size: 1.4rem; margin-top: 3rem;">💡 Recent Insights</div>', unsafe_allow_html=True)
         
-        insights = st.session_state.get('recent_insights', [
+        trend_insights = [
+            {
+                "text": f"Your {metric.replace('_', ' ')} has been {direction} recently",
+                "type": "info",
+                "icon": "📈" if direction == "increasing" else "📉" if direction == "decreasing" else "✅"
+            }
+            for metric, direction in trends.items()
+        ]
+        insights = st.session_state.get('recent_insights') or trend_insights or [
             {
                 "text": "Your blood pressure has been stable over the past month",
                 "type": "success",
@@ -754,24 +1139,17 @@ class HIAStreamlitApp:
                 "type": "info", 
                 "icon": "💊"
             }
-        ])
+        ]
         
-        for insight in insights:
-            insight_type = insight.get('type', 'info')
-            card_class = f"{insight_type}-card" if insight_type in ['success', 'warning', 'error'] else "info-card"
-            
-            st.markdown(f"""
-            <div class="{card_class}">
-                <div style="display: flex; align-items: flex-start; gap: 1rem;">
-                    <div style="font-size: 1.5rem; flex-shrink: 0;">{insight['icon']}</div>
-                    <div style="flex: 1;">
-                        <p style="margin: 0; line-height: 1.6; font-family: 'Inter', sans-serif; font-size: 0.95rem;">
-                            {insight['text']}
-                        </p>
-                    </div>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown("".join(
+            _INSIGHT_TMPL.format(
+                card_class=f"{insight.get('type')}-card"
+                if insight.get('type') in ('success', 'warning', 'error') else "info-card",
+                icon=insight['icon'],
+                text=insight['text'],
+            )
+            for insight in insights
+        ), unsafe_allow_html=True)
         
         # Quick stats
         col1, col2 = st.columns(2)
@@ -796,30 +1174,17 @@ class HIAStreamlitApp:
         
         with col2:
             st.markdown('<div class="section-header" style="font-size: 1.2rem;">📅 Upcoming</div>', unsafe_allow_html=True)
-            upcoming_items = [
-                {"icon": "🗓️", "text": "Annual check-up", "date": "Feb 15"},
-                {"icon": "💉", "text": "Flu vaccine", "date": "Oct 1"},
-                {"icon": "🦷", "text": "Dental cleaning", "date": "Mar 20"}
-            ]
-            
-            for item in upcoming_items:
-                st.markdown(f"""
-                <div style="display: flex; align-items: center; padding: 0.75rem; background-color: var(--light-bg); 
-                           border-radius: var(--border-radius); margin-bottom: 0.5rem; transition: all 0.3s ease;">
-                    <span style="font-size: 1.2rem; margin-right: 1rem;">{item['icon']}</span>
-                    <div style="flex: 1;">
-                        <div style="font-weight: 500; color: var(--text-primary);">{item['text']}</div>
-                        <div style="font-size: 0.8rem; color: var(--text-secondary);">{item['date']}</div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown("".join(_UPCOMING_TMPL.format(**item) for item in _UPCOMING_ITEMS),
+                        unsafe_allow_html=True)
     
+    @st.fragment
+    @timed_section
     def show_document_analysis(self):
         """Show document upload and analysis interface."""
         st.markdown('<div class="section-header">📄 Document Analysis</div>', unsafe_allow_html=True)
         
-        # Check for pending file from sidebar
-        pending_file = st.session_state.get('pending_file', None)
+        # Check for a pending upload from the sidebar
+        pending_upload = st.session_state.get('pending_upload')
         
         # File upload
         uploaded_file = st.file_uploader(
@@ -829,48 +1194,58 @@ class HIAStreamlitApp:
             key="main_upload"
         )
         
-        # Use pending file if available
-        file_to_process = pending_file or uploaded_file
+        # Use pending upload if available
+        upload = pending_upload or (save_upload(uploaded_file) if uploaded_file else None)
         
-        if file_to_process:
-            # Save uploaded file temporarily
-            temp_path = Path("temp") / file_to_process.name
-            temp_path.parent.mkdir(exist_ok=True)
-            
-            with open(temp_path, "wb") as f:
-                f.write(file_to_process.getbuffer())
-            
+        if upload:
             # Show file info
-            st.success(f"📄 Loaded: {file_to_process.name}")
-            st.info(f"File type: {file_to_process.type} | Size: {file_to_process.size:,} bytes")
+            st.success(f"📄 Loaded: {upload['name']}")
+            st.info(f"File type: {upload['type']} | Size: {upload['size']:,} bytes")
             
             # Analyze button
+            analyzed = st.session_state.setdefault('analyzed_digests', set())
             if st.button("🔍 Analyze Document", type="primary", use_container_width=True):
-                with st.spinner("Analyzing document..."):
-                    asyncio.run(self._analyze_document(temp_path))
-                    
-            # Clear pending file after processing
-            if pending_file:
-                st.session_state.pending_file = None
+                if upload['digest'] in analyzed:
+                    st.info("This document was already analyzed - see Analysis Results below.")
+                else:
+                    with st.spinner("Analyzing document..."):
+                        succeeded = run_async(self._analyze_document(upload['path'], upload['name']))
+                    # Failed attempts stay retryable
+                    if succeeded:
+                        analyzed.add(upload['digest'])
+                
+                # Clear pending upload once it has been handled
+                st.session_state.pending_upload = None
         
         # Show analysis results
         if st.session_state.analysis_results:
             st.markdown('<div class="section-header" style="font-size: 1.4rem; margin-top: 3rem;">📊 Analysis Results</div>', unsafe_allow_html=True)
             
-            for result in st.session_state.analysis_results:
+            # Only build one page of results per rerun
+            results = list(st.session_state.analysis_results)
+            page_size = 10
+            page = 0
+            if len(results) > page_size:
+                page = st.number_input("Page", min_value=0,
+                                       max_value=(len(results) - 1) // page_size,
+                                       value=0, step=1, key="analysis_page")
+            
+            for result in results[page * page_size:(page + 1) * page_size]:
                 with st.expander(f"📄 {result['filename']} - {result['date']}"):
                     st.markdown("**Summary:**")
                     st.write(result.get('summary', 'No summary available'))
                     
                     st.markdown("**Extracted Values:**")
-                    values_df = pd.DataFrame(result.get('values', []))
-                    if not values_df.empty:
-                        st.dataframe(values_df)
+                    values = result.get('values')
+                    if values:
+                        st.dataframe(values_dataframe(values))
                     
                     st.markdown("**Recommendations:**")
                     for rec in result.get('recommendations', []):
                         st.markdown(f"- {rec}")
     
+    @st.fragment
+    @timed_section
     def show_health_qa(self):
         """Show health Q&A chat interface."""
         st.markdown('<div class="section-header">💬 Health Q&A</div>', unsafe_allow_html=True)
@@ -895,9 +1270,11 @@ class HIAStreamlitApp:
                     'timestamp': datetime.now()
                 })
                 
-                # Get response
-                with st.spinner("Thinking..."):
-                    response = asyncio.run(self._get_chat_response(user_input))
+                # Stream the response in as it is generated
+                placeholder = st.empty()
+                placeholder.markdown("**HIA:** _Thinking..._")
+                response = run_async(self._get_chat_response(user_input, placeholder))
+                placeholder.empty()
                 
                 st.session_state.chat_history.append({
                     'role': 'assistant',
@@ -906,15 +1283,22 @@ class HIAStreamlitApp:
                 })
         
         # Display chat history
+        # Only the latest messages render by default; older ones are opt-in
         with chat_container:
-            for message in st.session_state.chat_history:
-                if message['role'] == 'user':
-                    st.markdown(f"**You:** {message['content']}")
-                else:
-                    st.markdown(f"**HIA:** {message['content']}")
-                st.caption(message['timestamp'].strftime("%I:%M %p"))
-                st.divider()
+            history = list(st.session_state.chat_history)
+            recent = history[-20:]
+            older = history[:-20]
+            
+            if older:
+                with st.expander(f"Show {len(older)} older messages"):
+                    if st.toggle("Load older messages", key="show_older"):
+                        st.markdown(format_chat_markdown(older))
+            
+            if recent:
+                st.markdown(format_chat_markdown(recent))
     
+    @st.fragment
+    @timed_section
     def show_trends(self):
         """Show health trends and analytics."""
         st.markdown('<div class="section-header">📈 Health Trends & Analytics</div>', unsafe_allow_html=True)
@@ -924,27 +1308,30 @@ class HIAStreamlitApp:
         with col1:
             time_range = st.selectbox(
                 "Select time range",
-                ["Last Week", "Last Month", "Last Quarter", "Last Year", "All Time"]
+                list(_TREND_PERIODS)
             )
         
-        # Metric selector
-        selected_metrics = st.multiselect(
-            "Select metrics to view",
-            ["Blood Pressure", "Glucose", "Cholesterol", "Weight", "Heart Rate"],
-            default=["Blood Pressure", "Glucose"]
-        )
+        df = fetch_metrics_df(st.session_state.session_token, time_range)
         
-        if selected_metrics:
-            # Generate and display charts
-            for metric in selected_metrics:
-                st.markdown(f"### {metric} Trend")
-                
-                # Placeholder for actual chart
-                chart_placeholder = st.empty()
-                
-                # In real implementation, this would fetch data and create chart
-                # For now, show a placeholder
-                chart_placeholder.info(f"Chart for {metric} would be displayed here")
+        if df.empty:
+            st.info("No metric history yet. Analyze a document to start tracking trends.")
+        else:
+            # Metric selector
+            selected_metrics = st.multiselect(
+                "Select metrics to view",
+                list(df.columns),
+                default=list(df.columns[:2])
+            )
+            
+            if selected_metrics:
+                # All selected series are aggregated and drawn in one pass
+                selected = df[selected_metrics]
+                stats = selected.agg(['mean', 'std']).T
+                stats['latest'] = selected.ffill().iloc[-1]
+                # Metrics are sampled at different times; fill gaps between readings
+                plot_df = downsample(selected.interpolate(method='time', limit_area='inside'))
+                st.line_chart(plot_df)
+                st.dataframe(stats, use_container_width=True)
         
         # Insights section
         st.markdown('<div class="section-header" style="font-size: 1.4rem; margin-top: 3rem;">🔍 Key Insights</div>', unsafe_allow_html=True)
@@ -963,6 +1350,8 @@ class HIAStreamlitApp:
             st.metric("Exercise Days", "18/30", "+20%",
                      help="Compared to last month")
     
+    @st.fragment
+    @timed_section
     def show_reports(self):
         """Show report generation and history."""
         st.markdown('<div class="section-header">⚕️ Health Reports</div>', unsafe_allow_html=True)
@@ -988,7 +1377,7 @@ class HIAStreamlitApp:
             if st.button("📄 Generate Report", use_container_width=True):
                 with st.spinner("Generating report..."):
                     # Generate report
-                    report_path = asyncio.run(self._generate_report(
+                    report_path = run_async(self._generate_report(
                         report_type, include_options
                     ))
                     
@@ -1000,90 +1389,72 @@ class HIAStreamlitApp:
                             st.download_button(
                                 "📥 Download Report",
                                 f.read(),
-                                file_name=f"health_report_{datetime.now().strftime('%Y%m%d')}.pdf",
-                                mime="application/pdf"
+                                file_name=Path(report_path).name,
+                                mime="text/markdown"
                             )
         
         with col2:
             st.markdown("### Recent Reports")
             
-            # List recent reports
-            recent_reports = [
-                {"date": "2024-01-15", "type": "Annual Summary", "id": "rep_001"},
-                {"date": "2024-01-08", "type": "Lab Results", "id": "rep_002"},
-                {"date": "2023-12-20", "type": "Doctor Visit", "id": "rep_003"}
-            ]
+            # List recent reports in one table; actions apply to the selected row
+            selection = st.dataframe(
+                pd.DataFrame(_RECENT_REPORTS, columns=['type', 'date']),
+                column_config={
+                    'type': st.column_config.TextColumn("Report"),
+                    'date': st.column_config.TextColumn("Date"),
+                },
+                hide_index=True,
+                use_container_width=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key="recent_reports"
+            )
             
-            for report in recent_reports:
-                col1, col2, col3 = st.columns([3, 1, 1])
-                with col1:
-                    st.markdown(f"**{report['type']}**")
-                    st.caption(report['date'])
-                with col2:
-                    st.button("View", key=f"view_{report['id']}")
-                with col3:
-                    st.button("Share", key=f"share_{report['id']}")
-                st.divider()
+            rows = selection.selection.rows
+            report_id = _RECENT_REPORTS[rows[0]]['id'] if rows else None
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("View", key=f"view_{report_id}", disabled=report_id is None,
+                          use_container_width=True)
+            with col2:
+                st.button("Share", key=f"share_{report_id}", disabled=report_id is None,
+                          use_container_width=True)
     
     # Helper methods
     def _show_metric_card(self, name: str, value: str, status: str):
-        """Display an enhanced metric card with modern styling."""
-        # Map status to appropriate classes and icons
-        status_mapping = {
-            'normal': {'class': 'health-score-excellent', 'icon': '✅', 'label': 'Normal'},
-            'good': {'class': 'health-score-good', 'icon': '💙', 'label': 'Good'},
-            'warning': {'class': 'health-score-warning', 'icon': '⚠️', 'label': 'Attention'},
-            'critical': {'class': 'health-score-critical', 'icon': '🚨', 'label': 'Critical'},
-            'unknown': {'class': 'health-score-unknown', 'icon': '❓', 'label': 'No Data'}
-        }
-        
-        status_info = status_mapping.get(status, status_mapping['unknown'])
+        """Display a metric card with its status."""
+        status_info = _STATUS_MAPPING.get(status, _STATUS_MAPPING['unknown'])
         
-        st.markdown(f"""
-        <div class="metric-card fade-in-up">
-            <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 1rem;">
-                <h4>{name}</h4>
-                <span style="font-size: 1.2rem;">{status_info['icon']}</span>
-            </div>
-            <div class="metric-value {status_info['class']}">{value}</div>
-            <div style="font-size: 0.8rem; color: var(--text-secondary); margin-top: 0.5rem;">
-                Status: {status_info['label']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.metric(label=f"{status_info['icon']} {name}", value=value,
+                  help=f"Status: {status_info['label']}")
     
-    async def _update_dashboard_metrics(self):
-        """Update dashboard metrics from memory store."""
-        try:
-            recent_metrics = await self.memory_store.get_recent_metrics()
-            st.session_state.current_metrics = recent_metrics
-        except Exception as e:
-            st.error(f"Error loading metrics: {str(e)}")
-    
-    async def _analyze_document(self, file_path: Path):
-        """Analyze uploaded document."""
+    @timed_section
+    async def _analyze_document(self, file_path: Path, filename: Optional[str] = None) -> bool:
+        """
+        Analyze uploaded document, reporting it under filename when given.
+        
+        Returns:
+            True if an analysis result was recorded, False otherwise
+        """
+        filename = filename or file_path.name
         if not self.gemini_api_key:
             st.error("⚠️ **Gemini API Key Required**")
             st.info("Please set up your Gemini API key in the login screen first!")
-            return
+            return False
             
         if not self.executor:
             st.error("⚠️ **System Error**")
             st.info("Please refresh the page after setting up your API key.")
-            return
+            return False
         
+        recorded = False
         try:
-            # Import the components we need
-            from src.utils.document_parser import DocumentParser
-            from src.api.gemini_client import GeminiClient
-            
             # Step 1: Parse the document
             st.info("📄 Parsing document...")
-            parser = DocumentParser()
             
             # Parse document with detailed error handling
             try:
-                document_data = await parser.parse_document(file_path)
+                document_data = await get_parser().parse_document(str(file_path))
                 st.success("✅ Document parsed successfully!")
             except RuntimeError as e:
                 # OCR/dependency error
@@ -1099,6 +1470,8 @@ class HIAStreamlitApp:
                         st.write(f"• {note}")
             
             # Step 2: Display extracted content
+            text = document_data.get('cleaned_text', '')
+            store_metrics = None
             with st.expander("📊 Extracted Data", expanded=True):
                 # Show metadata
                 if document_data.get('metadata'):
@@ -1109,40 +1482,33 @@ class HIAStreamlitApp:
                 # Show extracted values
                 if document_data.get('extracted_values'):
                     st.write("\n**Extracted Health Metrics:**")
-                    values_df = pd.DataFrame(document_data['extracted_values'])
-                    st.dataframe(values_df, use_container_width=True)
+                    st.dataframe(values_dataframe(document_data['extracted_values']),
+                                 use_container_width=True)
                     
-                    # Store metrics in memory
-                    try:
-                        metrics = {}
-                        for val in document_data['extracted_values']:
-                            metrics[val['test_name']] = {
-                                'value': val['value'],
-                                'unit': val.get('unit', '')
-                            }
-                        await self.memory_store.store_health_metrics(
-                            metrics, 
-                            source=f"document_{file_path.name}"
-                        )
-                        st.success(f"✅ Stored {len(metrics)} health metrics")
-                    except Exception as e:
-                        st.warning(f"Could not store metrics: {str(e)}")
+                    # Store metrics in memory in the background; the AI summary
+                    # below doesn't depend on it, so the two overlap
+                    metrics = {
+                        val['test_name']: {'value': val['value'], 'unit': val.get('unit', '')}
+                        for val in document_data['extracted_values']
+                    }
+                    store_metrics = asyncio.create_task(self.memory_store.store_health_metrics(
+                        metrics, 
+                        source=f"document_{filename}"
+                    ))
+                    store_status = st.empty()
                 else:
                     st.info("No health metrics found in document")
                 
                 # Show text preview
-                if document_data.get('cleaned_text'):
+                if text:
                     st.write("\n**Document Text Preview:**")
-                    text_preview = document_data['cleaned_text'][:500] + "..." if len(document_data['cleaned_text']) > 500 else document_data['cleaned_text']
-                    st.text(text_preview)
+                    st.text(f"{text[:500]}..." if len(text) > 500 else text)
             
             # Step 3: AI Analysis
-            if self.gemini_api_key and document_data.get('cleaned_text'):
+            if self.gemini_api_key and text:
                 st.info("🤖 Generating AI analysis...")
                 
                 try:
-                    client = GeminiClient(self.gemini_api_key)
-                    
                     # Create a comprehensive prompt
                     analysis_prompt = f"""
                     Analyze this medical document and provide a patient-friendly summary.
@@ -1150,7 +1516,7 @@ class HIAStreamlitApp:
                     Document Type: {document_data.get('file_type', 'Unknown')}
                     Metadata: {document_data.get('metadata', {})}
                     Extracted Values: {document_data.get('extracted_values', [])[:20]}  # Limit to first 20
-                    Document Text (first 1000 chars): {document_data.get('cleaned_text', '')[:1000]}
+                    Document Text (first 1000 chars): {text[:1000]}
                     
                     Please provide:
                     1. What type of medical document this is
@@ -1163,7 +1529,7 @@ class HIAStreamlitApp:
                     """
                     
                     # Get AI analysis
-                    ai_summary = await client.generate_text(analysis_prompt)
+                    ai_summary = await summarize_document_cached(self.gemini_api_key, analysis_prompt)
                     
                     # Display AI summary
                     st.markdown("### 🤖 AI Health Analysis")
@@ -1171,7 +1537,7 @@ class HIAStreamlitApp:
                     
                     # Store the analysis result
                     analysis_result = {
-                        'filename': file_path.name,
+                        'filename': filename,
                         'date': datetime.now().strftime("%Y-%m-%d"),
                         'summary': ai_summary,
                         'values': document_data.get('extracted_values', []),
@@ -1184,18 +1550,20 @@ class HIAStreamlitApp:
                     }
                     
                     st.session_state.analysis_results.append(analysis_result)
+                    recorded = True
                     
                     # Store document in memory
                     try:
                         await self.memory_store.store_document(
-                            document_id=f"doc_{datetime.now().timestamp()}",
-                            content=document_data.get('cleaned_text', ''),
+                            document_id=f"doc_{uuid.uuid4().hex}",
+                            content=text,
                             document_type=document_data.get('file_type', 'unknown'),
                             metadata={
                                 **document_data.get('metadata', {}),
                                 'summary': ai_summary
                             }
                         )
+                        st.session_state.pop('_ctx_cache', None)
                     except Exception as e:
                         st.warning(f"Could not store document: {str(e)}")
                     
@@ -1209,7 +1577,7 @@ class HIAStreamlitApp:
                 
                 # Still save basic results
                 analysis_result = {
-                    'filename': file_path.name,
+                    'filename': filename,
                     'date': datetime.now().strftime("%Y-%m-%d"),
                     'summary': 'Document parsed successfully. AI analysis not available.',
                     'values': document_data.get('extracted_values', []),
@@ -1217,6 +1585,17 @@ class HIAStreamlitApp:
                     'recommendations': ['Review with healthcare provider']
                 }
                 st.session_state.analysis_results.append(analysis_result)
+                recorded = True
+            
+            if store_metrics is not None:
+                try:
+                    await store_metrics
+                    fetch_dashboard_data.clear()
+                    fetch_metrics_df.clear()
+                    st.session_state.pop('_ctx_cache', None)
+                    store_status.success(f"✅ Stored {len(metrics)} health metrics")
+                except Exception as e:
+                    store_status.warning(f"Could not store metrics: {str(e)}")
             
         except RuntimeError as e:
             # Handle system dependency errors (like missing Tesseract)
@@ -1240,93 +1619,46 @@ class HIAStreamlitApp:
             st.info("**Supported formats:** PDF, PNG, JPG, JPEG, DOCX, TXT")
             
         except Exception as e:
-            logger.error(f"Error in document analysis: {str(e)}")
+            logger.exception(f"Error in document analysis: {str(e)}")
             st.error("❌ **Analysis Failed**")
             st.markdown(f"**Error:** {str(e)}")
             
-            # Provide helpful debugging information
-            with st.expander("🔧 Debugging Information"):
-                st.markdown(f"**File:** {file_path}")
-                st.markdown(f"**File exists:** {file_path.exists()}")
-                st.markdown(f"**File size:** {file_path.stat().st_size if file_path.exists() else 'N/A'} bytes")
-                st.markdown(f"**Error type:** {type(e).__name__}")
-                
-                # Check system dependencies
-                st.markdown("**System Dependencies:**")
-                try:
-                    import pytesseract
-                    tesseract_version = pytesseract.get_tesseract_version()
-                    st.success(f"✅ Tesseract OCR: {tesseract_version}")
-                except:
-                    st.error("❌ Tesseract OCR: Not available")
-                
-                try:
-                    import PyPDF2
-                    st.success("✅ PyPDF2: Available")
-                except:
-                    st.error("❌ PyPDF2: Not available")
+            # Provide helpful debugging information when asked for in Settings
+            if st.session_state.get('debug_mode', False):
+                with st.expander("🔧 Debugging Information"):
+                    st.markdown(f"**File:** {file_path}")
+                    st.markdown(f"**File exists:** {file_path.exists()}")
+                    st.markdown(f"**File size:** {file_path.stat().st_size if file_path.exists() else 'N/A'} bytes")
+                    st.markdown(f"**Error type:** {type(e).__name__}")
                 
-                try:
-                    from PIL import Image
-                    st.success("✅ PIL (Image processing): Available")
-                except:
-                    st.error("❌ PIL: Not available")
-                
-                try:
-                    import docx
-                    st.success("✅ python-docx: Available")
-                except:
-                    st.error("❌ python-docx: Not available")
+                    # Check system dependencies
+                    st.markdown("**System Dependencies:**")
+                    for name, status in dependency_status().items():
+                        if status:
+                            st.success(f"✅ {name}: {status}")
+                        else:
+                            st.error(f"❌ {name}: Not available")
                 
-                # Show traceback for debugging
-                import traceback
-                st.code(traceback.format_exc())
+                    # Show traceback for debugging
+                    import traceback
+                    st.code(traceback.format_exc())
+        
+        return recorded
     
-    async def _get_chat_response(self, user_input: str) -> str:
-        """Get response from health agent."""
+    @timed_section
+    async def _get_chat_response(self, user_input: str, placeholder=None) -> str:
+        """Get response from health agent, streaming into placeholder when given."""
         if not self.gemini_api_key:
             return "Please set up your Gemini API key in the login screen to use the chat feature."
         
         try:
-            # Get relevant context from memory
-            context = await self.memory_store.get_relevant_context(user_input)
-            
-            # Use Gemini directly for Q&A
-            from src.api.gemini_client import GeminiClient
-            gemini = GeminiClient(self.gemini_api_key)
+            response = ""
+            async for delta in self._stream_chat_response(user_input):
+                response += delta
+                if placeholder is not None:
+                    placeholder.markdown(f"**HIA:** {response}▌")
             
-            # Build context string
-            context_str = ""
-            if context.get('recent_metrics'):
-                context_str += "\nRecent Health Metrics:\n"
-                for metric, data in context['recent_metrics'].items():
-                    context_str += f"- {metric}: {data.get('value')} {data.get('unit', '')}\n"
-            
-            if context.get('documents'):
-                context_str += "\nRecent Documents:\n"
-                for doc in context['documents'][:3]:  # Limit to 3 most relevant
-                    context_str += f"- {doc.get('metadata', {}).get('document_type', 'Document')}: {doc.get('content', '')[:200]}...\n"
-            
-            prompt = f"""
-            You are HIA (Health Insights Agent), a knowledgeable and friendly AI health assistant.
-            
-            User's Health Context:
-            {context_str if context_str else "No previous health data available."}
-            
-            User Question: {user_input}
-            
-            Please provide a helpful, accurate, and easy-to-understand response. Consider:
-            1. Answer the question directly and clearly
-            2. If discussing health metrics, explain what normal ranges are
-            3. Provide practical advice when appropriate
-            4. Always remind users to consult healthcare providers for medical decisions
-            5. Be empathetic and supportive
-            
-            If you don't have enough information to answer fully, acknowledge this and suggest what information would be helpful.
-            """
-            
-            response = await gemini.generate_text(prompt)
-            return response
+            return response or "I couldn't generate a response. Please try rephrasing your question."
             
         except Exception as e:
             logger.error(f"Error in chat response: {str(e)}")
@@ -1341,13 +1673,90 @@ class HIAStreamlitApp:
             else:
                 return f"😔 I encountered an error while processing your question. Error: {str(e)}\n\nPlease try again or rephrase your question."
     
+    async def _stream_chat_response(self, user_input: str) -> AsyncIterator[str]:
+        """Yield the health agent's answer to user_input as it is generated."""
+        # Get relevant context from memory, reusing it for repeat questions
+        context_cache = st.session_state.setdefault('_ctx_cache', {})
+        cache_key = hashlib.blake2b(user_input.strip().lower().encode(), digest_size=16).hexdigest()
+        context = context_cache.get(cache_key)
+        if context is None:
+            context = await self.memory_store.get_relevant_context(user_input)
+            context_cache[cache_key] = context
+            if len(context_cache) > _CONTEXT_CACHE_SIZE:
+                del context_cache[next(iter(context_cache))]
+        
+        # Use Gemini directly for Q&A
+        gemini = get_gemini(self.gemini_api_key)
+        
+        # Build context string
+        parts = []
+        if context.get('recent_metrics'):
+            parts.append("\nRecent Health Metrics:")
+            parts.extend(
+                f"- {metric}: {data.get('value')} {data.get('unit', '')}"
+                for metric, data in context['recent_metrics'].items()
+            )
+        
+        if context.get('documents'):
+            parts.append("\nRecent Documents:")
+            parts.extend(
+                f"- {doc.get('metadata', {}).get('document_type', 'Document')}: {doc.get('content', '')[:200]}..."
+                for doc in context['documents'][:3]  # Limit to 3 most relevant
+            )
+        context_str = "\n".join(parts)
+        
+        prompt = f"""
+        You are HIA (Health Insights Agent), a knowledgeable and friendly AI health assistant.
+        
+        User's Health Context:
+        {context_str if context_str else "No previous health data available."}
+        
+        User Question: {user_input}
+        
+        Please provide a helpful, accurate, and easy-to-understand response. Consider:
+        1. Answer the question directly and clearly
+        2. If discussing health metrics, explain what normal ranges are
+        3. Provide practical advice when appropriate
+        4. Always remind users to consult healthcare providers for medical decisions
+        5. Be empathetic and supportive
+        
+        If you don't have enough information to answer fully, acknowledge this and suggest what information would be helpful.
+        """
+        
+        async for delta in gemini.stream_text(prompt):
+            yield delta
+    
+    @timed_section
     async def _generate_report(self, report_type: str, 
                               include_options: List[str]) -> Optional[str]:
         """Generate health report."""
         try:
-            # This would use the executor to generate report
-            # For now, return a placeholder
-            return "reports/sample_report.pdf"
+            metrics, medications, trends = await asyncio.gather(
+                self.memory_store.get_recent_metrics(),
+                self.memory_store.get_active_medications(),
+                self.memory_store.analyze_trends()
+            )
+            
+            sections = {}
+            if "Recent Lab Results" in include_options:
+                sections["Recent Lab Results"] = "\n".join(
+                    f"- {name}: {data['value']} {data.get('unit') or ''}".rstrip()
+                    for name, data in metrics.items()
+                ) or "No recent results."
+            if "Medication List" in include_options:
+                sections["Medication List"] = "\n".join(
+                    f"- {med['name']} {med.get('dosage') or ''} {med.get('frequency') or ''}".rstrip()
+                    for med in medications
+                ) or "No active medications."
+            if "Health Trends" in include_options:
+                sections["Health Trends"] = "\n".join(
+                    f"- {name}: {direction}" for name, direction in trends.items()
+                ) or "Not enough history to show trends."
+            
+            # Rendering and file I/O run in a worker thread, off the script thread
+            return await asyncio.to_thread(
+                write_report, get_report_template(), report_type, sections
+            )
         except Exception as e:
             st.error(f"Error generating report: {str(e)}")
             return None
@@ -1,5 +1,17 @@
-from .document_parser import DocumentParser
-from .security import SecurityManager
-from .visualizations import HealthVisualizer
+import importlib
 
-__all__ = ['DocumentParser', 'SecurityManager', 'HealthVisualizer']
\ No newline at end of file
+# Exports resolve on first access so importing one submodule does not pull in
+# the heavier dependencies of the others
+_EXPORTS = {
+    'DocumentParser': '.document_parser',
+    'SecurityManager': '.security',
+    'HealthVisualizer': '.visualizations',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,61 @@
+import asyncio
+import copy
 import logging
 import io
 import os
+import shlex
 import shutil
-from typing import Dict, Any, List, Optional, Union
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import PyPDF2
 import pytesseract
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageFilter
 import docx
 import re
 from datetime import datetime
 
+try:
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+except ImportError:  # Optional: OCR falls back to the tesseract CLI via pytesseract
+    PyTessBaseAPI = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Section body following a header: at most 1000 characters up to the next
+# capitalized line or blank line, then (group 2) the next non-space character
+# if the section has more text, so the scan stops near the part that is kept
+_SECTION_BODY = r'[:\s]+((?:(?!\n[A-Z]|\n\n).){0,1000})(?:(?:(?!\n[A-Z]|\n\n)\s)*(\S))?'
+
+
+def _fuse_test_patterns(test_patterns):
+    """
+    Combines (pattern, test name) pairs into one case-insensitive alternation.
+    
+    Args:
+        test_patterns: Compiled patterns, highest priority first, each capturing
+            the value and optionally the unit
+        
+    Returns:
+        The fused pattern and a mapping of each alternative's group name to its
+        (test name, value group index, unit group index or None)
+    """
+    alternatives = []
+    groups = {}
+    index = 1
+    for i, (pattern, test_name) in enumerate(test_patterns):
+        name = f"t{i}"
+        alternatives.append(f"(?P<{name}>{pattern.pattern})")
+        groups[name] = (test_name, index + 1, index + 2 if pattern.groups >= 2 else None)
+        index += pattern.groups + 1
+    return re.compile("|".join(alternatives), re.IGNORECASE), groups
+
 
 class DocumentParser:
     """
@@ -21,6 +63,116 @@ class DocumentParser:
     Extracts text and structured information from medical documents.
     """
     
+    # Text cleanup patterns
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _NON_MEDICAL_RE = re.compile(r'[^\w\s\-.,/:;()%°]')
+    
+    # Common OCR errors, fixed in one pass: lone lowercase L to 1, lone
+    # uppercase O to 0, and l/ to 1/
+    _OCR_FIX_RE = re.compile(r'\bl\b|\bO\b|l/')
+    _OCR_FIXES = {'l': '1', 'O': '0', 'l/': '1/'}
+    
+    # Common medical document patterns
+    patterns = {
+        'date': re.compile(r'\b(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})\b'),
+        'patient_name': re.compile(r'Patient(?:\s+Name)?:\s*([A-Za-z\s]+)', re.IGNORECASE),
+        'doctor_name': re.compile(r'(?:Dr\.|Doctor|Physician):\s*([A-Za-z\s]+)', re.IGNORECASE),
+        'medical_record_number': re.compile(r'MRN?:\s*(\d+)', re.IGNORECASE),
+        'lab_result': re.compile(r'([A-Za-z\s]+):\s*(\d+\.?\d*)\s*([A-Za-z/%]+)?', re.IGNORECASE)
+    }
+    
+    _REPORT_DATE_RE = re.compile(
+        r'(?:Report|Test|Lab)\s+Date:\s*(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})', re.IGNORECASE
+    )
+    
+    # Common medical test patterns - ordered from most specific to least specific
+    _TEST_PATTERNS = (
+        # Cholesterol tests - specific ones first to avoid conflicts
+        (re.compile(r'LDL\s*(?:Cholesterol)?[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'LDL Cholesterol'),
+        (re.compile(r'HDL\s*(?:Cholesterol)?[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'HDL Cholesterol'),
+        (re.compile(r'(?:Total\s+)?Cholesterol[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'Total Cholesterol'),
+        (re.compile(r'Triglycerides[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'Triglycerides'),
+        
+        # Blood tests
+        (re.compile(r'(?:Hemoglobin|Hgb|HGB)[:\s]+(\d+\.?\d*)\s*(g/dL|g/dl)?', re.IGNORECASE), 'Hemoglobin'),
+        (re.compile(r'(?:Glucose|GLU|Blood\s+Glucose)[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'Glucose'),
+        (re.compile(r'(?:Blood\s+)?Pressure[:\s]+(\d+/\d+)\s*(mmHg)?', re.IGNORECASE), 'Blood Pressure'),
+        
+        # Complete Blood Count
+        (re.compile(r'(?:WBC|White\s+Blood\s+Cells?)[:\s]+(\d+\.?\d*)\s*(K/uL|cells/uL|K/μL)?', re.IGNORECASE), 'White Blood Cells'),
+        (re.compile(r'(?:RBC|Red\s+Blood\s+Cells?)[:\s]+(\d+\.?\d*)\s*(M/uL|M/μL)?', re.IGNORECASE), 'Red Blood Cells'),
+        (re.compile(r'Platelets?[:\s]+(\d+\.?\d*)\s*(K/uL|K/μL)?', re.IGNORECASE), 'Platelets'),
+        (re.compile(r'Hematocrit[:\s]+(\d+\.?\d*)\s*%?', re.IGNORECASE), 'Hematocrit'),
+        
+        # Metabolic panel
+        (re.compile(r'Creatinine[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'Creatinine'),
+        (re.compile(r'BUN[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'BUN'),
+        (re.compile(r'(?:Sodium|Na)[:\s]+(\d+\.?\d*)\s*(mEq/L|mmol/L)?', re.IGNORECASE), 'Sodium'),
+        (re.compile(r'(?:Potassium|K)[:\s]+(\d+\.?\d*)\s*(mEq/L|mmol/L)?', re.IGNORECASE), 'Potassium'),
+        (re.compile(r'(?:Chloride|Cl)[:\s]+(\d+\.?\d*)\s*(mEq/L|mmol/L)?', re.IGNORECASE), 'Chloride'),
+        
+        # Liver function
+        (re.compile(r'(?:ALT|SGPT)[:\s]+(\d+\.?\d*)\s*(U/L|IU/L)?', re.IGNORECASE), 'ALT'),
+        (re.compile(r'(?:AST|SGOT)[:\s]+(\d+\.?\d*)\s*(U/L|IU/L)?', re.IGNORECASE), 'AST'),
+        (re.compile(r'(?:Total\s+)?Bilirubin[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', re.IGNORECASE), 'Bilirubin'),
+        (re.compile(r'(?:Alkaline\s+)?Phosphatase[:\s]+(\d+\.?\d*)\s*(U/L|IU/L)?', re.IGNORECASE), 'Alkaline Phosphatase'),
+        
+        # Thyroid function
+        (re.compile(r'TSH[:\s]+(\d+\.?\d*)\s*(mIU/L|μIU/ml)?', re.IGNORECASE), 'TSH'),
+        (re.compile(r'T4[:\s]+(\d+\.?\d*)\s*(μg/dL|pmol/L)?', re.IGNORECASE), 'T4'),
+        (re.compile(r'T3[:\s]+(\d+\.?\d*)\s*(ng/dL|pmol/L)?', re.IGNORECASE), 'T3'),
+        
+        # Diabetes markers
+        (re.compile(r'(?:HbA1c|A1C|Hemoglobin\s+A1c)[:\s]+(\d+\.?\d*)\s*%?', re.IGNORECASE), 'HbA1c'),
+        
+        # Inflammation markers
+        (re.compile(r'(?:ESR|Sed\s+Rate)[:\s]+(\d+\.?\d*)\s*(mm/hr)?', re.IGNORECASE), 'ESR'),
+        (re.compile(r'(?:CRP|C-Reactive\s+Protein)[:\s]+(\d+\.?\d*)\s*(mg/L|mg/dL)?', re.IGNORECASE), 'CRP'),
+        
+        # Vitamins
+        (re.compile(r'Vitamin\s+D[:\s]+(\d+\.?\d*)\s*(ng/mL|nmol/L)?', re.IGNORECASE), 'Vitamin D'),
+        (re.compile(r'Vitamin\s+B12[:\s]+(\d+\.?\d*)\s*(pg/mL|pmol/L)?', re.IGNORECASE), 'Vitamin B12'),
+        (re.compile(r'Folate[:\s]+(\d+\.?\d*)\s*(ng/mL|nmol/L)?', re.IGNORECASE), 'Folate'),
+    )
+    
+    # All test patterns as one alternation, scanned in a single pass
+    _TEST_VALUES_RE, _TEST_GROUPS = _fuse_test_patterns(_TEST_PATTERNS)
+    
+    # Common section headers
+    _SECTION_PATTERNS = (
+        ('chief_complaint', re.compile(r'(?:Chief\s+Complaint|CC|Reason\s+for\s+Visit)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('history', re.compile(r'(?:History|HPI|Past\s+Medical\s+History)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('medications', re.compile(r'(?:Medications?|Current\s+Medications?|Meds)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('allergies', re.compile(r'(?:Allergies|Drug\s+Allergies)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('assessment', re.compile(r'(?:Assessment|Impression|Diagnosis)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('plan', re.compile(r'(?:Plan|Treatment\s+Plan|Recommendations?)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('lab_results', re.compile(r'(?:Lab\s+Results?|Laboratory\s+Results?)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+        ('vital_signs', re.compile(r'(?:Vital\s+Signs?|Vitals)' + _SECTION_BODY, re.IGNORECASE | re.DOTALL)),
+    )
+    
+    # Image OCR preprocessing: largest size kept (~300 DPI for a letter page),
+    # and the neighbourhood radius and offset for adaptive thresholding
+    _OCR_MAX_SIZE = (3300, 3300)
+    _THRESHOLD_RADIUS = 15
+    _THRESHOLD_OFFSET = 10
+    
+    # Characters OCR may emit for standalone images
+    _IMAGE_OCR_WHITELIST = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,:-/()%'
+    
+    # Medication patterns
+    _MED_PATTERNS = (
+        # Standard format: Drug name dose frequency
+        re.compile(r'([A-Za-z]+(?:\s+[A-Za-z]+)?)\s+(\d+\.?\d*\s*(?:mg|mcg|g|ml|units?))\s+([A-Za-z\s]+(?:daily|BID|TID|QID|PRN))', re.IGNORECASE),
+        # Alternative format
+        re.compile(r'([A-Za-z]+(?:\s+[A-Za-z]+)?)\s+-\s+(\d+\.?\d*\s*(?:mg|mcg|g|ml|units?))', re.IGNORECASE),
+    )
+    
+    # Read buffer for PDFs; PyPDF2 seeks around the file in small reads
+    _READ_BUFFER_SIZE = 1 << 16
+    
+    # Parse results kept in memory per parser
+    _PARSE_CACHE_SIZE = 256
+    
     def __init__(self):
         self.supported_formats = {
             '.pdf': self._parse_pdf,
@@ -36,14 +188,35 @@ class DocumentParser:
         # Check if Tesseract is available
         self.tesseract_available = self._check_tesseract()
         
-        # Common medical document patterns
-        self.patterns = {
-            'date': r'\b(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})\b',
-            'patient_name': r'Patient(?:\s+Name)?:\s*([A-Za-z\s]+)',
-            'doctor_name': r'(?:Dr\.|Doctor|Physician):\s*([A-Za-z\s]+)',
-            'medical_record_number': r'MRN?:\s*(\d+)',
-            'lab_result': r'([A-Za-z\s]+):\s*(\d+\.?\d*)\s*([A-Za-z/%]+)?'
-        }
+        # OCR worker pool, created on first use and kept so its threads (and
+        # their tesserocr APIs) are reused across documents
+        self._ocr_executor: Optional[ThreadPoolExecutor] = None
+        
+        # Per-thread tesserocr APIs, so the language model loads once per thread;
+        # every API created is also tracked so close() can end it
+        self._tess_local = threading.local()
+        self._tess_apis: List[Any] = []
+        self._ocr_lock = threading.Lock()
+        
+        # Recent parse results keyed by (path, size, mtime), most recent last
+        self._parse_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._parse_cache_lock = threading.Lock()
+    
+    def close(self) -> None:
+        """
+        Shuts down the OCR worker pool and ends its tesserocr APIs.
+        
+        Must not be called while a parse is in progress. The parser stays
+        usable; OCR resources are recreated on next use.
+        """
+        with self._ocr_lock:
+            executor, self._ocr_executor = self._ocr_executor, None
+            apis, self._tess_apis = self._tess_apis, []
+            self._tess_local = threading.local()
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for api in apis:
+            api.End()
     
     def _check_tesseract(self) -> bool:
         """Check if Tesseract OCR is installed and available."""
@@ -65,6 +238,9 @@ class DocumentParser:
         """
         Parses a medical document and extracts text and structured information.
         
+        Results are remembered per file until it is modified, so re-submitting
+        the same document skips OCR and extraction.
+        
         Args:
             file_path: Path to the document file
             
@@ -81,6 +257,48 @@ class DocumentParser:
         if file_extension not in self.supported_formats:
             raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: {', '.join(self.supported_formats.keys())}")
         
+        stat = file_path.stat()
+        cache_key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None:
+                self._parse_cache.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+        
+        # Extraction is blocking file, OCR and regex work; keep it off the event loop
+        result = await asyncio.to_thread(self._parse_uncached, file_path, file_extension)
+        
+        # Failed extractions may succeed on retry, so only successes are kept
+        if not result['raw_text'].startswith("Unable to"):
+            with self._parse_cache_lock:
+                self._parse_cache[cache_key] = result
+                if len(self._parse_cache) > self._PARSE_CACHE_SIZE:
+                    self._parse_cache.popitem(last=False)
+        return copy.deepcopy(result)
+    
+    async def parse_documents(self, file_paths: List[Union[str, Path]]) -> List[Dict[str, Any]]:
+        """
+        Parses several documents concurrently.
+        
+        At most half the CPUs' worth of documents are extracted at once, since
+        each scanned PDF already spreads its OCR across the CPUs.
+        
+        Args:
+            file_paths: Paths to the document files
+            
+        Returns:
+            One parse_document result per path, in the same order
+        """
+        limit = asyncio.Semaphore(max(1, (os.cpu_count() or 1) // 2))
+        
+        async def parse_one(file_path: Union[str, Path]) -> Dict[str, Any]:
+            async with limit:
+                return await self.parse_document(file_path)
+        
+        return await asyncio.gather(*(parse_one(file_path) for file_path in file_paths))
+    
+    def _parse_uncached(self, file_path: Path, file_extension: str) -> Dict[str, Any]:
+        """Parses a validated document; see parse_document."""
         logger.info(f"Parsing document: {file_path}")
         
         # Check if OCR is needed and available
@@ -93,7 +311,7 @@ class DocumentParser:
         
         # Parse the document
         parser_func = self.supported_formats[file_extension]
-        raw_text = await parser_func(file_path)
+        raw_text = parser_func(file_path)
         
         # Check if parsing returned an error message
         if raw_text.startswith("Unable to") and not self.tesseract_available:
@@ -140,27 +358,25 @@ class DocumentParser:
         
         return notes
     
-    async def _parse_pdf(self, file_path: Path) -> str:
+    def _parse_pdf(self, file_path: Path) -> str:
         """Extracts text from PDF files."""
         text_content = []
         
         try:
-            with open(file_path, 'rb') as file:
+            with open(file_path, 'rb', buffering=self._READ_BUFFER_SIZE) as file:
                 pdf_reader = PyPDF2.PdfReader(file)
                 
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text = page.extract_text()
-                    text_content.append(f"--- Page {page_num + 1} ---\n{text}")
+                for page_num, page in enumerate(pdf_reader.pages, 1):
+                    text_content.append(f"--- Page {page_num} ---\n{page.extract_text() or ''}")
             
             return "\n\n".join(text_content)
             
         except Exception as e:
             logger.error(f"Error parsing PDF: {str(e)}")
             # Try OCR as fallback
-            return await self._parse_pdf_with_ocr(file_path)
+            return self._parse_pdf_with_ocr(file_path)
     
-    async def _parse_pdf_with_ocr(self, file_path: Path) -> str:
+    def _parse_pdf_with_ocr(self, file_path: Path) -> str:
         """Fallback OCR for PDFs that can't be parsed normally."""
         if not self.tesseract_available:
             return ("Unable to extract text from PDF: This appears to be a scanned/image-based PDF. "
@@ -171,12 +387,11 @@ class DocumentParser:
             # Convert PDF pages to images and OCR them
             from pdf2image import convert_from_path
             
-            images = convert_from_path(file_path)
-            text_content = []
-            
-            for i, image in enumerate(images):
-                text = pytesseract.image_to_string(image, config='--psm 3')
-                text_content.append(f"--- Page {i + 1} ---\n{text}")
+            images = convert_from_path(file_path, thread_count=os.cpu_count() or 1)
+            text_content = [
+                f"--- Page {page_num} ---\n{text}"
+                for page_num, text in enumerate(self._ocr_pages(images, config='--psm 3 --oem 1'), 1)
+            ]
             
             extracted_text = "\n\n".join(text_content)
             
@@ -191,7 +406,144 @@ class DocumentParser:
             logger.error(f"Error in PDF OCR: {str(e)}")
             return f"Unable to extract text from PDF: OCR failed with error: {str(e)}"
     
-    async def _parse_image(self, file_path: Path) -> str:
+    def _ocr_pages(self, images: List[Image.Image], config: str = '') -> List[str]:
+        """
+        OCRs several images, splitting them into one contiguous batch per CPU.
+        
+        Each batch runs as its own single-threaded tesseract process (see
+        _ocr_batch), or on its worker's tesserocr API when that is installed;
+        either way the GIL is released while tesseract works, so the batches
+        run concurrently on the parser's OCR pool.
+        
+        Args:
+            images: Page images in order
+            config: Extra tesseract options
+            
+        Returns:
+            Extracted text for each image, in the same order
+        """
+        workers = min(os.cpu_count() or 1, len(images))
+        if workers <= 1:
+            return self._ocr_batch(images, config)
+        
+        size = -(-len(images) // workers)
+        batches = [images[i:i + size] for i in range(0, len(images), size)]
+        with self._ocr_lock:
+            if self._ocr_executor is None:
+                self._ocr_executor = ThreadPoolExecutor(
+                    max_workers=os.cpu_count() or 1, thread_name_prefix='hia_ocr'
+                )
+            executor = self._ocr_executor
+        results = executor.map(lambda batch: self._ocr_batch(batch, config), batches)
+        return [text for batch_text in results for text in batch_text]
+    
+    def _ocr_batch(self, images: List[Image.Image], config: str = '') -> List[str]:
+        """
+        OCRs several images with a single tesseract run.
+        
+        Tesseract accepts a text file listing image paths and separates each
+        image's output with a form feed, so the process and language model
+        start once per batch instead of once per page. Tesseract's OpenMP
+        threading scales poorly, so the process is limited to one thread and
+        _ocr_pages runs batches in parallel instead; the limit is set in the
+        child's environment only. With tesserocr installed the batch is
+        recognized in-process instead.
+        
+        Args:
+            images: Page images in order
+            config: Extra tesseract CLI options (the tesserocr path uses --psm 3 --oem 1)
+            
+        Returns:
+            Extracted text for each image, in the same order
+        """
+        if PyTessBaseAPI is not None:
+            return self._tess_ocr(images)
+        
+        with tempfile.TemporaryDirectory(prefix='hia_ocr_') as tmpdir:
+            page_paths = []
+            for i, image in enumerate(images, 1):
+                page_path = os.path.join(tmpdir, f"page_{i}.png")
+                image.save(page_path)
+                page_paths.append(page_path)
+            
+            list_path = os.path.join(tmpdir, "pages.txt")
+            with open(list_path, 'w', encoding='utf-8') as list_file:
+                list_file.write("\n".join(page_paths) + "\n")
+            
+            # Called directly rather than via pytesseract, which always passes
+            # this process's environment to tesseract
+            try:
+                proc = subprocess.run(
+                    [pytesseract.pytesseract.tesseract_cmd, list_path, 'stdout',
+                     *shlex.split(config)],
+                    capture_output=True,
+                    env={**os.environ, 'OMP_THREAD_LIMIT': '1'},
+                )
+            except FileNotFoundError:
+                raise pytesseract.TesseractNotFoundError()
+            if proc.returncode:
+                raise pytesseract.TesseractError(
+                    proc.returncode, proc.stderr.decode('utf-8', errors='replace').strip()
+                )
+            output = proc.stdout.decode('utf-8')
+        
+        pages = output.split('\f')
+        return [pages[i] if i < len(pages) else '' for i in range(len(images))]
+    
+    def _preprocess_for_ocr(self, image: Image.Image) -> Image.Image:
+        """
+        Binarizes a photo or scan so tesseract sees clean, high-contrast text.
+        
+        Oversized images are scaled down first, since recognition time grows
+        with pixel count. Each pixel is then thresholded against its local
+        Gaussian-weighted mean, which copes with uneven lighting, and a median
+        filter removes the speckle that thresholding leaves behind.
+        
+        Args:
+            image: Image as loaded from disk
+            
+        Returns:
+            Grayscale image containing only black and white pixels
+        """
+        image = image.convert('L')
+        image.thumbnail(self._OCR_MAX_SIZE)
+        
+        pixels = np.asarray(image, dtype=np.int16)
+        local_mean = np.asarray(
+            image.filter(ImageFilter.GaussianBlur(self._THRESHOLD_RADIUS)), dtype=np.int16
+        )
+        binary = np.where(pixels > local_mean - self._THRESHOLD_OFFSET, 255, 0).astype(np.uint8)
+        
+        return Image.fromarray(binary).filter(ImageFilter.MedianFilter(3))
+    
+    def _tess_ocr(self, images: List[Image.Image], whitelist: str = '') -> List[str]:
+        """
+        OCRs images in-process with this thread's tesserocr API (automatic page
+        segmentation and the LSTM engine, as --psm 3 --oem 1), avoiding a
+        subprocess per call. The API lives as long as its thread, so the model
+        loads once per OCR pool worker rather than once per document.
+        
+        Args:
+            images: Images in order
+            whitelist: Characters to restrict recognition to; empty allows all
+            
+        Returns:
+            Extracted text for each image, in the same order
+        """
+        api = getattr(self._tess_local, 'api', None)
+        if api is None:
+            api = self._tess_local.api = PyTessBaseAPI(psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+            with self._ocr_lock:
+                self._tess_apis.append(api)
+        api.SetVariable('tessedit_char_whitelist', whitelist)
+        
+        texts = []
+        for image in images:
+            api.SetImage(image)
+            texts.append(api.GetUTF8Text())
+        return texts
+    
+    def _parse_image(self, file_path: Path) -> str:
         """Extracts text from image files using OCR."""
         if not self.tesseract_available:
             return ("Unable to extract text from image: Tesseract OCR is required but not installed. "
@@ -202,15 +554,15 @@ class DocumentParser:
             image = Image.open(file_path)
             
             # Preprocess image for better OCR
-            # Convert to grayscale
-            if image.mode != 'L':
-                image = image.convert('L')
-            
-            # Enhance image for better OCR (optional improvements)
-            # Could add more preprocessing here if needed
+            image = self._preprocess_for_ocr(image)
             
             # Extract text using OCR with optimized settings
-            text = pytesseract.image_to_string(image, config='--psm 3 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,:-/()%')
+            if PyTessBaseAPI is not None:
+                text = self._tess_ocr([image], whitelist=self._IMAGE_OCR_WHITELIST)[0]
+            else:
+                text = pytesseract.image_to_string(
+                    image, config=f'--psm 3 --oem 1 -c tessedit_char_whitelist={self._IMAGE_OCR_WHITELIST}'
+                )
             
             # Check if OCR extracted meaningful text
             if len(text.strip()) < 5:
@@ -224,37 +576,35 @@ class DocumentParser:
             logger.error(f"Error parsing image: {str(e)}")
             return f"Unable to extract text from image: {str(e)}"
     
-    async def _parse_docx(self, file_path: Path) -> str:
+    def _parse_docx(self, file_path: Path) -> str:
         """Extracts text from Word documents."""
         try:
             doc = docx.Document(file_path)
-            
-            text_content = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text_content.append(paragraph.text)
-            
-            # Also extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    row_text = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_text.append(cell.text.strip())
-                    if row_text:
-                        text_content.append(" | ".join(row_text))
-            
-            return "\n".join(text_content)
+            return "\n".join(self._iter_docx_lines(doc))
             
         except Exception as e:
             logger.error(f"Error parsing DOCX: {str(e)}")
             return "Unable to extract text from document"
     
-    async def _parse_text(self, file_path: Path) -> str:
+    @staticmethod
+    def _iter_docx_lines(doc) -> Iterator[str]:
+        """Yields a Word document's non-empty paragraphs, then its table rows as 'a | b' lines."""
+        for paragraph in doc.paragraphs:
+            text = paragraph.text
+            if text.strip():
+                yield text
+        
+        # Also extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                cells = [text for text in (cell.text.strip() for cell in row.cells) if text]
+                if cells:
+                    yield " | ".join(cells)
+    
+    def _parse_text(self, file_path: Path) -> str:
         """Reads plain text files."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return file_path.read_text(encoding='utf-8', errors='replace')
         except Exception as e:
             logger.error(f"Error reading text file: {str(e)}")
             return "Unable to read text file"
@@ -262,20 +612,13 @@ class DocumentParser:
     def _clean_text(self, text: str) -> str:
         """Cleans and normalizes extracted text."""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self._WHITESPACE_RE.sub(' ', text)
         
         # Remove special characters but keep medical symbols
-        text = re.sub(r'[^\w\s\-.,/:;()%°]', ' ', text)
+        text = self._NON_MEDICAL_RE.sub(' ', text)
         
         # Fix common OCR errors
-        ocr_corrections = {
-            r'\bl\b': '1',  # lowercase L to 1
-            r'\bO\b': '0',  # uppercase O to 0
-            r'l\/': '1/',    # l/ to 1/
-        }
-        
-        for pattern, replacement in ocr_corrections.items():
-            text = re.sub(pattern, replacement, text)
+        text = self._OCR_FIX_RE.sub(lambda match: self._OCR_FIXES[match.group()], text)
         
         return text.strip()
     
@@ -284,27 +627,26 @@ class DocumentParser:
         metadata = {}
         
         # Extract dates
-        date_matches = re.findall(self.patterns['date'], text)
+        date_matches = self.patterns['date'].findall(text)
         if date_matches:
             metadata['dates'] = date_matches
             # Try to identify report date
-            report_date_pattern = r'(?:Report|Test|Lab)\s+Date:\s*(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})'
-            report_date = re.search(report_date_pattern, text, re.IGNORECASE)
+            report_date = self._REPORT_DATE_RE.search(text)
             if report_date:
                 metadata['report_date'] = report_date.group(1)
         
         # Extract patient name
-        patient_match = re.search(self.patterns['patient_name'], text, re.IGNORECASE)
+        patient_match = self.patterns['patient_name'].search(text)
         if patient_match:
             metadata['patient_name'] = patient_match.group(1).strip()
         
         # Extract doctor name
-        doctor_match = re.search(self.patterns['doctor_name'], text, re.IGNORECASE)
+        doctor_match = self.patterns['doctor_name'].search(text)
         if doctor_match:
             metadata['doctor_name'] = doctor_match.group(1).strip()
         
         # Extract MRN
-        mrn_match = re.search(self.patterns['medical_record_number'], text, re.IGNORECASE)
+        mrn_match = self.patterns['medical_record_number'].search(text)
         if mrn_match:
             metadata['mrn'] = mrn_match.group(1)
         
@@ -314,73 +656,15 @@ class DocumentParser:
         """Extracts medical test values from text."""
         values = []
         
-        # Common medical test patterns - ordered from most specific to least specific
-        test_patterns = [
-            # Cholesterol tests - specific ones first to avoid conflicts
-            (r'LDL\s*(?:Cholesterol)?[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'LDL Cholesterol'),
-            (r'HDL\s*(?:Cholesterol)?[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'HDL Cholesterol'),
-            (r'(?:Total\s+)?Cholesterol[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'Total Cholesterol'),
-            (r'Triglycerides[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'Triglycerides'),
-            
-            # Blood tests
-            (r'(?:Hemoglobin|Hgb|HGB)[:\s]+(\d+\.?\d*)\s*(g/dL|g/dl)?', 'Hemoglobin'),
-            (r'(?:Glucose|GLU|Blood\s+Glucose)[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'Glucose'),
-            (r'(?:Blood\s+)?Pressure[:\s]+(\d+/\d+)\s*(mmHg)?', 'Blood Pressure'),
-            
-            # Complete Blood Count
-            (r'(?:WBC|White\s+Blood\s+Cells?)[:\s]+(\d+\.?\d*)\s*(K/uL|cells/uL|K/μL)?', 'White Blood Cells'),
-            (r'(?:RBC|Red\s+Blood\s+Cells?)[:\s]+(\d+\.?\d*)\s*(M/uL|M/μL)?', 'Red Blood Cells'),
-            (r'Platelets?[:\s]+(\d+\.?\d*)\s*(K/uL|K/μL)?', 'Platelets'),
-            (r'Hematocrit[:\s]+(\d+\.?\d*)\s*%?', 'Hematocrit'),
-            
-            # Metabolic panel
-            (r'Creatinine[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'Creatinine'),
-            (r'BUN[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'BUN'),
-            (r'(?:Sodium|Na)[:\s]+(\d+\.?\d*)\s*(mEq/L|mmol/L)?', 'Sodium'),
-            (r'(?:Potassium|K)[:\s]+(\d+\.?\d*)\s*(mEq/L|mmol/L)?', 'Potassium'),
-            (r'(?:Chloride|Cl)[:\s]+(\d+\.?\d*)\s*(mEq/L|mmol/L)?', 'Chloride'),
-            
-            # Liver function
-            (r'(?:ALT|SGPT)[:\s]+(\d+\.?\d*)\s*(U/L|IU/L)?', 'ALT'),
-            (r'(?:AST|SGOT)[:\s]+(\d+\.?\d*)\s*(U/L|IU/L)?', 'AST'),
-            (r'(?:Total\s+)?Bilirubin[:\s]+(\d+\.?\d*)\s*(mg/dL|mg/dl)?', 'Bilirubin'),
-            (r'(?:Alkaline\s+)?Phosphatase[:\s]+(\d+\.?\d*)\s*(U/L|IU/L)?', 'Alkaline Phosphatase'),
-            
-            # Thyroid function
-            (r'TSH[:\s]+(\d+\.?\d*)\s*(mIU/L|μIU/ml)?', 'TSH'),
-            (r'T4[:\s]+(\d+\.?\d*)\s*(μg/dL|pmol/L)?', 'T4'),
-            (r'T3[:\s]+(\d+\.?\d*)\s*(ng/dL|pmol/L)?', 'T3'),
-            
-            # Diabetes markers
-            (r'(?:HbA1c|A1C|Hemoglobin\s+A1c)[:\s]+(\d+\.?\d*)\s*%?', 'HbA1c'),
-            
-            # Inflammation markers
-            (r'(?:ESR|Sed\s+Rate)[:\s]+(\d+\.?\d*)\s*(mm/hr)?', 'ESR'),
-            (r'(?:CRP|C-Reactive\s+Protein)[:\s]+(\d+\.?\d*)\s*(mg/L|mg/dL)?', 'CRP'),
-            
-            # Vitamins
-            (r'Vitamin\s+D[:\s]+(\d+\.?\d*)\s*(ng/mL|nmol/L)?', 'Vitamin D'),
-            (r'Vitamin\s+B12[:\s]+(\d+\.?\d*)\s*(pg/mL|pmol/L)?', 'Vitamin B12'),
-            (r'Folate[:\s]+(\d+\.?\d*)\s*(ng/mL|nmol/L)?', 'Folate'),
-        ]
-        
-        for pattern, test_name in test_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                value_dict = {
-                    'test_name': test_name,
-                    'value': match.group(1),
-                    'unit': match.group(2) if match.lastindex >= 2 else None,
-                    'position': match.start()
-                }
-                values.append(value_dict)
-        
-        # Sort by position in document
-        values.sort(key=lambda x: x['position'])
-        
-        # Remove position from final output
-        for v in values:
-            v.pop('position', None)
+        # Matches arrive in document order; at any position the most specific
+        # test wins and consumes the text, so generic patterns don't re-report it
+        for match in self._TEST_VALUES_RE.finditer(text):
+            test_name, value_group, unit_group = self._TEST_GROUPS[match.lastgroup]
+            values.append({
+                'test_name': test_name,
+                'value': match.group(value_group),
+                'unit': match.group(unit_group) if unit_group else None
+            })
         
         return values
     
@@ -388,26 +672,14 @@ class DocumentParser:
         """Identifies common sections in medical documents."""
         sections = {}
         
-        # Common section headers
-        section_patterns = {
-            'chief_complaint': r'(?:Chief\s+Complaint|CC|Reason\s+for\s+Visit)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'history': r'(?:History|HPI|Past\s+Medical\s+History)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'medications': r'(?:Medications?|Current\s+Medications?|Meds)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'allergies': r'(?:Allergies|Drug\s+Allergies)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'assessment': r'(?:Assessment|Impression|Diagnosis)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'plan': r'(?:Plan|Treatment\s+Plan|Recommendations?)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'lab_results': r'(?:Lab\s+Results?|Laboratory\s+Results?)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)',
-            'vital_signs': r'(?:Vital\s+Signs?|Vitals)[:\s]+(.*?)(?=\n[A-Z]|\n\n|\Z)'
-        }
-        
-        for section_name, pattern in section_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        for section_name, pattern in self._SECTION_PATTERNS:
+            match = pattern.search(text)
             if match:
-                content = match.group(1).strip()
+                content = match.group(1)
                 # Limit section length
-                if len(content) > 1000:
+                if match.group(2) is not None:
                     content = content[:997] + "..."
-                sections[section_name] = content
+                sections[section_name] = content.strip()
         
         return sections
     
@@ -422,26 +694,22 @@ class DocumentParser:
         text = document_data['cleaned_text']
         
         medications = []
+        seen = set()
         
-        # Medication patterns
-        med_patterns = [
-            # Standard format: Drug name dose frequency
-            r'([A-Za-z]+(?:\s+[A-Za-z]+)?)\s+(\d+\.?\d*\s*(?:mg|mcg|g|ml|units?))\s+([A-Za-z\s]+(?:daily|BID|TID|QID|PRN))',
-            # Alternative format
-            r'([A-Za-z]+(?:\s+[A-Za-z]+)?)\s+-\s+(\d+\.?\d*\s*(?:mg|mcg|g|ml|units?))',
-        ]
-        
-        for pattern in med_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                med = {
-                    'name': match.group(1).strip(),
-                    'dosage': match.group(2).strip() if match.lastindex >= 2 else 'Unknown',
-                    'frequency': match.group(3).strip() if match.lastindex >= 3 else 'As directed'
-                }
+        for pattern in self._MED_PATTERNS:
+            for match in pattern.finditer(text):
+                name = match.group(1).strip()
                 
                 # Avoid duplicates
-                if not any(m['name'].lower() == med['name'].lower() for m in medications):
-                    medications.append(med)
+                key = name.lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                
+                medications.append({
+                    'name': name,
+                    'dosage': match.group(2).strip() if match.lastindex >= 2 else 'Unknown',
+                    'frequency': match.group(3).strip() if match.lastindex >= 3 else 'As directed'
+                })
         
         return medications
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 import os
 import hashlib
 import secrets
+import threading
 from typing import Dict, Any, Optional, Union
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -32,8 +33,9 @@ class SecurityManager:
         # Initialize encryption
         self._initialize_encryption()
         
-        # Session management
+        # Session management; the manager is shared across app sessions and threads
         self.sessions = {}
+        self._sessions_lock = threading.Lock()
         self.session_timeout = timedelta(hours=1)
     
     def _initialize_encryption(self):
@@ -184,11 +186,13 @@ class SecurityManager:
         """
         session_token = secrets.token_urlsafe(32)
         
-        self.sessions[session_token] = {
-            'user_id': user_id,
-            'created_at': datetime.now(),
-            'last_accessed': datetime.now()
-        }
+        now = datetime.now()
+        with self._sessions_lock:
+            self.sessions[session_token] = {
+                'user_id': user_id,
+                'created_at': now,
+                'last_accessed': now
+            }
         
         return session_token
     
@@ -202,25 +206,26 @@ class SecurityManager:
         Returns:
             User ID if valid, None otherwise
         """
-        if session_token not in self.sessions:
-            return None
-        
-        session = self.sessions[session_token]
-        
-        # Check timeout
-        if datetime.now() - session['last_accessed'] > self.session_timeout:
-            del self.sessions[session_token]
-            return None
-        
-        # Update last accessed
-        session['last_accessed'] = datetime.now()
-        
-        return session['user_id']
+        with self._sessions_lock:
+            session = self.sessions.get(session_token)
+            if session is None:
+                return None
+            
+            # Check timeout
+            now = datetime.now()
+            if now - session['last_accessed'] > self.session_timeout:
+                del self.sessions[session_token]
+                return None
+            
+            # Update last accessed
+            session['last_accessed'] = now
+            
+            return session['user_id']
     
     def end_session(self, session_token: str):
         """Ends a user session."""
-        if session_token in self.sessions:
-            del self.sessions[session_token]
+        with self._sessions_lock:
+            self.sessions.pop(session_token, None)
     
     def sanitize_filename(self, filename: str) -> str:
         """
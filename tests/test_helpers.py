@@ -0,0 +1,197 @@
+"""Tests for the pure helpers behind the UI, document parser and executor."""
+
+import asyncio
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.agent.executor import HealthTaskExecutor
+from src.agent.planner import Task, TaskType
+from src.ui.components import lttb_indices
+from src.utils.document_parser import DocumentParser, _fuse_test_patterns
+
+
+def test_lttb_keeps_endpoints_and_returns_n_out_indices():
+    x = np.arange(1000)
+    y = np.sin(x / 25.0)
+
+    indices = lttb_indices(x, y, 50)
+
+    assert len(indices) == 50
+    assert indices[0] == 0
+    assert indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_lttb_keeps_a_lone_spike():
+    y = np.zeros(500)
+    y[237] = 100.0
+
+    assert 237 in lttb_indices(np.arange(500), y, 20)
+
+
+def test_lttb_accepts_datetimes():
+    x = pd.date_range('2024-01-01', periods=300, freq='h').to_numpy()
+
+    indices = lttb_indices(x, np.random.default_rng(0).normal(size=300), 30)
+
+    assert len(indices) == 30
+    assert (indices[0], indices[-1]) == (0, 299)
+
+
+def test_lttb_returns_everything_when_nothing_to_drop():
+    assert list(lttb_indices(range(10), range(10), 10)) == list(range(10))
+    assert list(lttb_indices(range(10), range(10), 2)) == list(range(10))
+
+
+LAB_REPORT = """
+Lab Results:
+- Glucose: 95 mg/dL
+- Total Cholesterol: 180 mg/dL
+- LDL Cholesterol: 110 mg/dL
+- HDL 60
+- Blood Pressure: 120/80 mmHg
+- Hemoglobin A1c: 6.1 %
+- Hemoglobin: 14.5 g/dL
+- WBC: 7.2 K/uL, RBC 4.8, Platelets: 250
+- Sodium 140 mmol/L; K: 4.1; Cl 101
+- TSH: 2.5 mIU/L  T4: 1.1  T3 120 ng/dL
+- Vitamin D: 32 ng/mL, Vitamin B12 450 pg/mL
+"""
+
+
+def _separate_matches(test_patterns, text):
+    """Reference scan: at each position the highest-priority pattern wins and consumes it."""
+    found = []
+    pos = 0
+    while pos < len(text):
+        for pattern, test_name in test_patterns:
+            match = pattern.match(text, pos)
+            if match and match.end() > pos:
+                unit = match.group(2) if pattern.groups >= 2 else None
+                found.append((test_name, match.group(1), unit))
+                pos = match.end()
+                break
+        else:
+            pos += 1
+    return found
+
+
+def _fused_matches(test_patterns, text):
+    fused, groups = _fuse_test_patterns(test_patterns)
+    found = []
+    for match in fused.finditer(text):
+        test_name, value_group, unit_group = groups[match.lastgroup]
+        found.append((test_name, match.group(value_group),
+                      match.group(unit_group) if unit_group else None))
+    return found
+
+
+def test_fused_pattern_matches_the_separate_patterns():
+    patterns = DocumentParser._TEST_PATTERNS
+
+    expected = _separate_matches(patterns, LAB_REPORT)
+
+    assert expected
+    assert _fused_matches(patterns, LAB_REPORT) == expected
+
+
+def test_fused_pattern_maps_groups_per_alternative():
+    patterns = (
+        (re.compile(r'ab(\d)(x)?'), 'AB'),
+        (re.compile(r'a(\d)'), 'A'),
+    )
+
+    assert _fused_matches(patterns, 'ab1x a2 ab3') == [('AB', '1', 'x'), ('A', '2', None), ('AB', '3', None)]
+
+
+@pytest.fixture
+def counting_parser(monkeypatch):
+    parser = DocumentParser()
+    calls = []
+    parse_uncached = parser._parse_uncached
+
+    def counted(*args):
+        calls.append(args)
+        return parse_uncached(*args)
+
+    monkeypatch.setattr(parser, '_parse_uncached', counted)
+    return parser, calls
+
+
+def test_parse_cache_reuses_unchanged_file(tmp_path, counting_parser):
+    parser, calls = counting_parser
+    path = tmp_path / 'report.txt'
+    path.write_text(LAB_REPORT)
+
+    first = asyncio.run(parser.parse_document(path))
+    first['extracted_values'].clear()
+    second = asyncio.run(parser.parse_document(str(path)))
+
+    assert len(calls) == 1
+    assert second['extracted_values']
+
+
+def test_parse_cache_invalidates_on_size_change(tmp_path, counting_parser):
+    parser, calls = counting_parser
+    path = tmp_path / 'report.txt'
+    path.write_text(LAB_REPORT)
+    asyncio.run(parser.parse_document(path))
+
+    path.write_text(LAB_REPORT + "- Creatinine: 1.0 mg/dL\n")
+    result = asyncio.run(parser.parse_document(path))
+
+    assert len(calls) == 2
+    assert 'Creatinine' in {value['test_name'] for value in result['extracted_values']}
+
+
+def test_parse_cache_invalidates_on_mtime_change(tmp_path, counting_parser):
+    parser, calls = counting_parser
+    path = tmp_path / 'report.txt'
+    path.write_text(LAB_REPORT)
+    asyncio.run(parser.parse_document(path))
+
+    path.write_text(LAB_REPORT.replace('95', '99'))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    result = asyncio.run(parser.parse_document(path))
+
+    assert len(calls) == 2
+    assert {'test_name': 'Glucose', 'value': '99', 'unit': 'mg/dL'} in result['extracted_values']
+
+
+def _task(task_id, *dependencies):
+    return Task(id=task_id, type=TaskType.HEALTH_QUERY, description=task_id,
+                parameters={}, dependencies=list(dependencies))
+
+
+@pytest.fixture
+def executor():
+    return HealthTaskExecutor(gemini_api_key='test-key', memory_store=None)
+
+
+def _ids(levels):
+    return [[task.id for task in level] for level in levels]
+
+
+def test_dependency_levels_follow_dependencies(executor):
+    tasks = [_task('report', 'trend', 'query'), _task('trend', 'parse'),
+             _task('parse'), _task('query')]
+
+    assert _ids(executor._group_by_dependency_level(tasks)) == [
+        ['parse', 'query'], ['trend'], ['report']]
+
+
+def test_dependency_cycle_is_run_as_a_final_level(executor):
+    tasks = [_task('parse'), _task('a', 'b'), _task('b', 'a')]
+
+    assert _ids(executor._group_by_dependency_level(tasks)) == [['parse'], ['a', 'b']]
+
+
+def test_missing_dependency_is_run_as_a_final_level(executor):
+    tasks = [_task('parse'), _task('trend', 'parse', 'missing'), _task('report', 'trend')]
+
+    assert _ids(executor._group_by_dependency_level(tasks)) == [['parse'], ['trend', 'report']]